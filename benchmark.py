@@ -0,0 +1,918 @@
+import numpy as np
+import logistics
+import argparse
+import contextlib
+import gc
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+import warnings
+import config
+import routines
+import common
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
+
+# Renders off-screen (before anything imports matplotlib):
+os.environ.setdefault('MPLBACKEND', 'Agg')
+
+
+#* File Specifications:
+if True:
+    filename_main = os.path.basename(__file__)
+    home = os.path.expanduser('~')
+    path_home2main = os.path.relpath(__file__, start=home)
+    location_main = os.path.join(
+        '~', path_home2main[:-len(filename_main)]
+    )
+
+
+#* Assign Constants:
+if True:
+    repeats = 3 # Best-of-n timing for each measurement
+    min_time = 0.2 # Minimum total time (in s) spent on each measurement
+    mb = 2**20 # Bytes per megabyte
+    failures = [] # Names of failed checks (sets the exit status)
+    results = {} # Recorded times (in s), by benchmark key
+    threshold = 0.25 # Allowed slowdown (fraction) against the baseline
+
+
+#* Body:
+
+
+def measure(func, *args, **kwargs):
+    """
+        Times a call of func and records the peak memory 
+        allocated (via tracemalloc) during that call. 
+
+        --Parameters--
+        * func : callable // 
+            Function to be benchmarked. 
+        * *args, **kwargs // 
+            Arguments passed on to func. 
+
+        --Returns--
+        * best_time : float // 
+            Shortest wall-clock time (in s) from among the repeats 
+            (at least repeats calls, or more for calls shorter 
+            than min_time in total). 
+        * peak : int // 
+            Peak memory (in bytes) allocated during a single call. 
+    """    
+
+    # Short calls are repeated for at least min_time in total 
+    # (with garbage collection paused, as in timeit):
+    best_time, total_time, n = np.inf, 0., 0
+    gc.disable()
+    try:
+        while n < repeats or (total_time < min_time and n < 1000):
+            init_time = time.perf_counter()
+            func(*args, **kwargs)
+            t = time.perf_counter() - init_time
+            best_time, total_time, n = min(best_time, t), total_time + t, n + 1
+    finally:
+        gc.enable()
+
+    tracemalloc.start()
+    func(*args, **kwargs)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return best_time, peak
+
+
+def record(key:str, seconds:float):
+    """
+        Records a benchmark time, to be saved with --output and 
+        compared with --baseline. 
+
+        --Parameters--
+        * key : str // 
+            Unique name of the measurement, e.g. 'abs_max/float64'. 
+        * seconds : float // 
+            Measured time (lower is better). 
+    """    
+
+    results[key] = seconds
+
+
+def compare_to_baseline(path:str):
+    """
+        Compares the recorded times against a baseline JSON file 
+        (written earlier with --output); measurements which are 
+        slower by more than the threshold are failures. 
+
+        --Parameters--
+        * path : str // 
+            Path of the baseline file. 
+    """    
+
+    with open(path) as file:
+        baseline = json.load(file)['results']
+
+    print(f'comparison with baseline (threshold +{100 * threshold:.0f}%):')
+    for key in sorted(set(results) & set(baseline)):
+        ratio = results[key] / baseline[key] if baseline[key] else 1.
+        regressed = ratio > 1 + threshold
+        if regressed:
+            failures.append(key)
+        print(
+            f'  {key:<40s} | {baseline[key]:10.3e} s -> '
+            + f'{results[key]:10.3e} s | {ratio:5.2f}x'
+            + (' | REGRESSION' if regressed else '')
+        )
+
+
+def _abs_max_reference(arrs):
+    """ 
+        The original (unchunked) abs_max, kept for comparison.
+    """
+
+    maxes = [np.abs(arr).max() for arr in arrs]
+    return np.amax(maxes)
+
+
+def bench_abs_max(size:int=2**24):
+    """
+        Compares the chunked abs_max against the original 
+        (which allocates np.abs(arr) for each array), for 
+        in-memory and memory-mapped inputs. 
+
+        --Parameters--
+        * size : int, optional // 
+            Number of elements in each benchmarked array,  
+                * by default 2**24. 
+    """    
+
+    rng = np.random.default_rng(0)
+    real_arr = rng.standard_normal(size)
+    complex_arr = real_arr[:size//2] + 1j * real_arr[size//2:]
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, 'abs_max.npy')
+        np.save(path, real_arr)
+        mapped_arr = np.load(path, mmap_mode='r')
+
+        cases = [
+            ('float64', [real_arr]), 
+            ('complex128', [complex_arr]), 
+            ('memmap', [mapped_arr]), 
+        ]
+        variants = [
+            ('original', _abs_max_reference), 
+            ('chunked', common.abs_max), 
+            ('chunked, 4 threads', 
+                lambda arrs: common.abs_max(arrs, workers=4)), 
+        ]
+
+        print('abs_max:')
+        for case_label, arrs in cases:
+            nbytes = sum(arr.nbytes for arr in arrs)
+            for variant_label, func in variants:
+                t, peak = measure(func, arrs)
+                record(f'abs_max/{case_label}/{variant_label}', t)
+                print(
+                    f'  {case_label:>10s} | {variant_label:<18s} | '
+                    + f'{nbytes / mb / t:8.0f} MB/s | '
+                    + f'peak alloc {peak / mb:7.1f} MB'
+                )
+
+        del mapped_arr, cases, arrs # unmap before the directory goes
+
+
+def _separate_passes(arrs):
+    """ 
+        min, max, abs_max and L2 norm, each as a separate pass.
+    """
+
+    return (
+        min(arr.min() for arr in arrs), 
+        max(arr.max() for arr in arrs), 
+        _abs_max_reference(arrs), 
+        np.sqrt(sum(np.vdot(arr, arr) for arr in arrs)), 
+    )
+
+
+def bench_reduce_arrays(size:int=2**24):
+    """
+        Compares single-pass reduce_arrays against one 
+        pass per statistic. 
+
+        --Parameters--
+        * size : int, optional // 
+            Number of elements in the benchmarked array,  
+                * by default 2**24. 
+    """    
+
+    arrs = [np.random.default_rng(0).standard_normal(size)]
+    nbytes = arrs[0].nbytes
+    stats = ('min', 'max', 'abs_max', 'norm')
+    variants = [
+        ('separate passes', _separate_passes), 
+        ('reduce_arrays', 
+            lambda arrs: common.reduce_arrays(arrs, stats=stats)), 
+    ]
+
+    print('reduce_arrays (min, max, abs_max, norm):')
+    for variant_label, func in variants:
+        t, peak = measure(func, arrs)
+        record(f'reduce_arrays/{variant_label}', t)
+        print(
+            f'  {variant_label:<16s} | {nbytes / mb / t:8.0f} MB/s | '
+            + f'peak alloc {peak / mb:7.1f} MB'
+        )
+
+
+def bench_export_plots(n_figures:int=48, n_points:int=2000):
+    """
+        Reports figures per second written by export_plots 
+        for increasing numbers of worker processes. 
+
+        --Parameters--
+        * n_figures : int, optional // 
+            Number of figures rendered per measurement,  
+                * by default 48. 
+        * n_points : int, optional // 
+            Number of points in each of the two plotted series,  
+                * by default 2000. 
+    """    
+
+    x_arr = np.linspace(0, 2*np.pi, n_points)
+    worker_counts = [1]
+    while worker_counts[-1] < os.cpu_count():
+        worker_counts.append(min(2 * worker_counts[-1], os.cpu_count()))
+
+    print('export_plots:')
+    with tempfile.TemporaryDirectory() as out_dir:
+        specs = [
+            dict(
+                fig_label=f'fig_{i}', 
+                x_arrs=[x_arr, x_arr], 
+                y_arrs=[np.sin(i * x_arr), np.cos(i * x_arr)], 
+                plot_labels=['sin', 'cos'], 
+                legend=True, 
+                grid=True, 
+                save_path=os.path.join(out_dir, f'fig_{i}.png'), 
+            )
+            for i in range(n_figures)
+        ]
+        for workers in worker_counts:
+            init_time = time.perf_counter()
+            for _ in common.export_plots(specs, workers=workers):
+                pass
+            t = time.perf_counter() - init_time
+            record(f'export_plots/{workers} workers', t)
+            print(f'  {workers:3d} workers | {n_figures / t:7.1f} figures/s')
+
+
+def bench_decimation(n_points:int=2*10**6, max_points:int=2000):
+    """
+        Reports headless build_plot render time and output 
+        file sizes with and without decimation. 
+
+        --Parameters--
+        * n_points : int, optional // 
+            Number of points in the plotted series,  
+                * by default 2*10**6. 
+        * max_points : int, optional // 
+            Target number of points after decimation,  
+                * by default 2000. 
+    """    
+
+    rng = np.random.default_rng(0)
+    x_arr = np.linspace(0, 100, n_points)
+    y_arr = np.sin(x_arr) + 0.1 * rng.standard_normal(n_points)
+    variants = [
+        ('none', dict()), 
+        ('minmax', dict(max_points=max_points, decimation='minmax')), 
+        ('lttb', dict(max_points=max_points, decimation='lttb')), 
+    ]
+
+    print(f'build_plot decimation ({n_points} points):')
+    with tempfile.TemporaryDirectory() as out_dir:
+        for variant_label, kwargs in variants:
+            sizes = []
+            init_time = time.perf_counter()
+            for ext in ['png', 'svg']:
+                path = os.path.join(out_dir, f'{variant_label}.{ext}')
+                common.build_plot(
+                    'decimation', [x_arr], [y_arr], 
+                    headless=True, save_path=path, **kwargs
+                )
+                sizes.append(os.path.getsize(path))
+            t = time.perf_counter() - init_time
+            record(f'decimation/{variant_label}', t)
+            print(
+                f'  {variant_label:>6s} | {t:6.2f} s (png + svg) | '
+                + f'png {sizes[0] / mb:6.2f} MB | svg {sizes[1] / mb:6.2f} MB'
+            )
+
+
+def bench_progress(steps:int=10**6):
+    """
+        Reports the per-iteration overhead of print_loop_progress, 
+        ProgressReporter.update and the progress() iterator wrapper 
+        (all writing to os.devnull). 
+
+        --Parameters--
+        * steps : int, optional // 
+            Number of loop iterations,  
+                * by default 10**6. 
+    """    
+
+    def bare():
+        for i in range(steps):
+            pass
+
+    def loop_progress():
+        with contextlib.redirect_stdout(devnull):
+            for i in range(steps):
+                logistics.print_loop_progress(i, steps - 1)
+
+    def reporter_update():
+        reporter = logistics.ProgressReporter(
+            steps - 1, stream=devnull, enabled=True
+        )
+        for i in range(steps):
+            reporter.update(i)
+
+    def iterator_wrapper():
+        for i in logistics.progress(
+            range(steps), stream=devnull, enabled=True
+        ):
+            pass
+
+    variants = [
+        ('print_loop_progress', loop_progress), 
+        ('ProgressReporter', reporter_update), 
+        ('progress()', iterator_wrapper), 
+    ]
+
+    print(f'progress reporting ({steps} iterations):')
+    with open(os.devnull, 'w') as devnull:
+        t_bare, _ = measure(bare)
+        for variant_label, func in variants:
+            t, _ = measure(func)
+            record(f'progress/{variant_label}', t)
+            print(
+                f'  {variant_label:>19s} | '
+                + f'{(t - t_bare) / steps * 1e9:8.1f} ns/iteration overhead'
+            )
+
+
+def bench_time_stepping(sizes:List[int]=[2**8, 2**12, 2**16], steps:int=200):
+    """
+        Reports steps per second of the routines integrators 
+        against the number of grid points. 
+
+        --Parameters--
+        * sizes : List[int], optional // 
+            Numbers of grid points,  
+                * by default [2**8, 2**12, 2**16]. 
+        * steps : int, optional // 
+            Steps per measurement,  
+                * by default 200. 
+    """    
+
+    def heat_rhs(t, y, out):
+        # Periodic second difference, written into out:
+        np.subtract(y[2:], y[1:-1], out=out[1:-1])
+        out[1:-1] -= y[1:-1]
+        out[1:-1] += y[:-2]
+        out[0] = y[1] - 2*y[0] + y[-1]
+        out[-1] = y[0] - 2*y[-1] + y[-2]
+
+    print('time stepping (steps/s):')
+    for size in sizes:
+        grid = config.grid(0, 1, 1 / (size - 1))
+        x_arr = grid.arr
+        psi = np.exp(-((x_arr - 0.5) / 0.05)**2 + 50j * x_arr)
+        steppers = [
+            ('euler', routines.EulerStepper(heat_rhs, psi.real)), 
+            ('rk4', routines.RK4Stepper(heat_rhs, psi.real)), 
+            ('split-step', routines.SplitStepSchrodinger(
+                psi, 1e3 * (x_arr - 0.5)**2, grid=grid
+            )), 
+        ]
+        results = []
+        for stepper_label, stepper in steppers:
+            t_arr = np.arange(steps + 1) * 1e-6
+            t, _ = measure(routines.evolve, stepper, t_arr)
+            record(f'time_stepping/{stepper_label}/{size}', t)
+            results.append(f'{stepper_label} {steps / t:10.0f}')
+        print(f'  {size:7d} points | ' + ' | '.join(results))
+
+
+def bench_replica_jobs(n_jobs:int=8, steps:int=5):
+    """
+        Compares wall-clock times of n_jobs replica jobs run 
+        serially, in a thread pool, and with asyncio. 
+
+        --Parameters--
+        * n_jobs : int, optional // 
+            Number of replica jobs,  
+                * by default 8. 
+        * steps : int, optional // 
+            Number of replica-actions (0.1 s sleeps) per job,  
+                * by default 5. 
+    """    
+
+    def serial():
+        for _ in range(n_jobs):
+            common.replica_job(steps)
+
+    def thread_pool():
+        with ThreadPoolExecutor(max_workers=n_jobs) as executor:
+            list(executor.map(common.replica_job, [steps] * n_jobs))
+
+    def asyncio_runner():
+        common.run_replica_jobs(n_jobs, steps)
+
+    variants = [
+        ('serial', serial), 
+        ('thread pool', thread_pool), 
+        ('asyncio', asyncio_runner), 
+    ]
+
+    print(f'replica jobs ({n_jobs} jobs x {steps} steps):')
+    with open(os.devnull, 'w') as devnull:
+        for variant_label, func in variants:
+            init_time = time.perf_counter()
+            with contextlib.redirect_stdout(devnull):
+                func()
+            t = time.perf_counter() - init_time
+            record(f'replica_jobs/{variant_label}', t)
+            print(f'  {variant_label:>11s} | {t:6.2f} s')
+
+
+def bench_import_time(budget_ms:float=150, repeats:int=5):
+    """
+        Measures (with python -X importtime, in fresh interpreters) 
+        the cumulative import time of logistics, config and common, 
+        and checks that neither numpy nor matplotlib is executed 
+        at import; any module over budget_ms (or importing 
+        either package) is recorded as a failure. 
+
+        --Parameters--
+        * budget_ms : float, optional // 
+            Startup budget (in ms) of each module,  
+                * by default 150. 
+        * repeats : int, optional // 
+            Fresh interpreters per module (the best time is kept),  
+                * by default 5. 
+    """    
+
+    here = os.path.dirname(os.path.abspath(__file__))
+    
+    print(f'import time (budget {budget_ms:.0f} ms):')
+    for module in ['logistics', 'config', 'common']:
+        best_ms = np.inf
+        for _ in range(repeats):
+            completed = subprocess.run(
+                [sys.executable, '-X', 'importtime', '-c', f'import {module}'], 
+                cwd=here, capture_output=True, text=True, check=True
+            )
+            lines = completed.stderr.strip().splitlines()
+            cumulative_us = int(lines[-1].split('|')[1])
+            best_ms = min(best_ms, cumulative_us / 1e3)
+        packages = {line.split('|')[2].split('.')[0].strip() for line in lines}
+        heavy = sorted(packages & {'numpy', 'matplotlib'})
+        record(f'import/{module}', best_ms / 1e3)
+        ok = best_ms <= budget_ms and not heavy
+        if not ok:
+            failures.append(f'import {module}')
+        print(
+            f'  {module:>9s} | {best_ms:7.1f} ms | '
+            + (f'imports {", ".join(heavy)} | ' if heavy else '')
+            + ('ok' if ok else 'FAIL')
+        )
+
+
+def bench_timestring(n_calls:int=10**5):
+    """
+        Times logistics.seconds_to_timestring (per call) and 
+        seconds_to_timestrings (in bulk) over a spread of 
+        durations (both string forms). 
+
+        --Parameters--
+        * n_calls : int, optional // 
+            Number of calls per measurement,  
+                * by default 10**5. 
+    """    
+
+    durations = np.geomspace(1e-3, 1e5, n_calls).tolist()
+
+    def format_all(full_str):
+        for t in durations:
+            logistics.seconds_to_timestring(t, full_str=full_str)
+
+    print(f'seconds_to_timestring ({n_calls} times):')
+    for full_str in [False, True]:
+        t, _ = measure(format_all, full_str)
+        t_bulk, _ = measure(
+            logistics.seconds_to_timestrings, durations, full_str
+        )
+        record(f'timestring/full_str={full_str}', t)
+        record(f'timestring/bulk/full_str={full_str}', t_bulk)
+        print(
+            f'  full_str={str(full_str):<5s} | '
+            + f'scalar {t / n_calls * 1e9:8.1f} ns/time | '
+            + f'bulk {t_bulk / n_calls * 1e9:8.1f} ns/time'
+        )
+
+
+def bench_abs_max_dtypes(sizes:List[int]=[2**10, 2**16, 2**22]):
+    """
+        Times abs_max across array sizes and dtypes. 
+
+        --Parameters--
+        * sizes : List[int], optional // 
+            Numbers of elements,  
+                * by default [2**10, 2**16, 2**22]. 
+    """    
+
+    rng = np.random.default_rng(0)
+    dtypes = [np.int16, np.float32, np.float64, np.complex128]
+
+    print('abs_max (time per call):')
+    for size in sizes:
+        base = 1e3 * rng.standard_normal(size)
+        timings = []
+        for dtype in dtypes:
+            arr = base.astype(dtype)
+            t, _ = measure(common.abs_max, [arr])
+            record(f'abs_max/{np.dtype(dtype).name}/{size}', t)
+            timings.append(f'{np.dtype(dtype).name} {t * 1e3:8.3f} ms')
+        print(f'  {size:8d} elements | ' + ' | '.join(timings))
+
+
+def bench_build_plot(n_points:int=10**4):
+    """
+        Times headless build_plot rendering to Agg (PNG), 
+        with and without the usual options. 
+
+        --Parameters--
+        * n_points : int, optional // 
+            Number of points in each of the three series,  
+                * by default 10**4. 
+    """    
+
+    x_arr = np.linspace(0, 2*np.pi, n_points)
+    y_arrs = [np.sin(x_arr), np.cos(x_arr), np.sin(2*x_arr)]
+    variants = [
+        ('plain', dict()), 
+        ('styled', dict(
+            plot_labels=['a', 'b', 'c'], legend=True, grid=True, 
+            axes=True, x_label='x', y_label='y', plot_title='title'
+        )), 
+    ]
+
+    print(f'build_plot (headless, {n_points} points x 3):')
+    with tempfile.TemporaryDirectory() as out_dir:
+        path = os.path.join(out_dir, 'plot.png')
+        for variant_label, kwargs in variants:
+            t, _ = measure(
+                common.build_plot, 'bench', [x_arr] * 3, y_arrs, 
+                headless=True, save_path=path, **kwargs
+            )
+            record(f'build_plot/{variant_label}', t)
+            print(f'  {variant_label:>6s} | {t * 1e3:8.2f} ms')
+
+
+def bench_grid(sizes:List[int]=[2**10, 2**16, 2**20]):
+    """
+        Times construction of config grids (points, wavenumbers, 
+        weights), uncached and memoized. 
+
+        --Parameters--
+        * sizes : List[int], optional // 
+            Numbers of grid points,  
+                * by default [2**10, 2**16, 2**20]. 
+    """    
+
+    def build(step):
+        config.grid.cache_clear()
+        grid = config.grid(0, 1, step)
+        return grid.arr, grid.wavenumbers, grid.weights
+
+    print('config grids:')
+    for size in sizes:
+        step = 1 / (size - 1)
+        t_new, _ = measure(build, step)
+        t_cached, _ = measure(config.grid, 0, 1, step)
+        record(f'grid/new/{size}', t_new)
+        print(
+            f'  {size:8d} points | new {t_new * 1e3:8.3f} ms | '
+            + f'memoized {t_cached * 1e6:6.2f} us'
+        )
+
+
+def _make_result(seed:int, size:int)->np.ndarray:
+    """ 
+        Worker for bench_shared_arrays (result returned by pickling). 
+    """
+
+    return np.random.default_rng(seed).standard_normal(size)
+
+
+def _make_shared_result(seed:int, size:int)->common.SharedArrayRef:
+    """ 
+        Worker for bench_shared_arrays (result returned via shared memory). 
+    """
+
+    return common.share_array(_make_result(seed, size))
+
+
+def bench_shared_arrays(n_results:int=16, size:int=2**21, workers:int=2):
+    """
+        Compares returning worker results from a process pool by 
+        pickling against share_array/open_shared descriptors. 
+
+        --Parameters--
+        * n_results : int, optional // 
+            Number of worker results,  
+                * by default 16. 
+        * size : int, optional // 
+            Number of float64 elements per result,  
+                * by default 2**21 (16 MB). 
+        * workers : int, optional // 
+            Number of worker processes,  
+                * by default 2. 
+    """    
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    def pickled(executor):
+        return list(executor.map(
+            _make_result, range(n_results), [size] * n_results
+        ))
+
+    def shared(executor):
+        refs = executor.map(
+            _make_shared_result, range(n_results), [size] * n_results
+        )
+        return [common.open_shared(ref) for ref in refs]
+
+    print(f'worker results ({n_results} x {size * 8 / mb:.0f} MB):')
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pickled(executor) # starts the workers
+        for variant_label, func in [('pickled', pickled), ('shared', shared)]:
+            init_time = time.perf_counter()
+            arrs = func(executor)
+            common.abs_max(arrs)
+            t = time.perf_counter() - init_time
+            del arrs
+            record(f'shared_arrays/{variant_label}', t)
+            print(f'  {variant_label:>7s} | {t:6.2f} s')
+
+
+def bench_plot_series(n_series:int=2000, n_points:int=1000):
+    """
+        Compares collecting many series as lists of Python floats 
+        against a PlotSeries (memory, and abs_max over the values). 
+
+        --Parameters--
+        * n_series : int, optional // 
+            Number of series,  
+                * by default 2000. 
+        * n_points : int, optional // 
+            Number of points per series,  
+                * by default 1000. 
+    """    
+
+    x_arr = np.linspace(0, 1, n_points)
+    y_arr = np.sin(x_arr)
+
+    def collect_lists():
+        x_arrs = [x_arr.tolist() for _ in range(n_series)]
+        y_arrs = [y_arr.tolist() for _ in range(n_series)]
+        return x_arrs, y_arrs
+
+    def collect_series():
+        series = common.PlotSeries()
+        series.append(y_arr, x_arr)
+        for _ in range(n_series - 1):
+            series.append(y_arr)
+        return series
+
+    print(f'plot series ({n_series} x {n_points} points):')
+    x_arrs, y_arrs = collect_lists()
+    series = collect_series()
+    for variant_label, collect, values in [
+        ('lists', collect_lists, y_arrs), 
+        ('series', collect_series, series.y_data), 
+    ]:
+        t_collect, peak = measure(collect)
+        t_max, _ = measure(common.abs_max, values)
+        record(f'plot_series/{variant_label}/collect', t_collect)
+        record(f'plot_series/{variant_label}/abs_max', t_max)
+        print(
+            f'  {variant_label:>6s} | collect {t_collect * 1e3:7.1f} ms '
+            + f'({peak / mb:6.1f} MB) | abs_max {t_max * 1e3:7.2f} ms'
+        )
+
+
+def bench_running_stats(n_steps:int=500, n_points:int=2**14):
+    """
+        Compares storing every snapshot of a time loop and reducing 
+        afterwards against accumulating a RunningStats online. 
+
+        --Parameters--
+        * n_steps : int, optional // 
+            Number of time steps,  
+                * by default 500. 
+        * n_points : int, optional // 
+            Number of grid points,  
+                * by default 2**14. 
+    """    
+
+    x_arr = np.linspace(0, 2*np.pi, n_points)
+    phases = np.linspace(0, 2*np.pi, n_steps)
+
+    def stored():
+        snapshots = np.empty((n_steps, n_points))
+        for i, phase in enumerate(phases):
+            np.sin(x_arr + phase, out=snapshots[i])
+        return (
+            snapshots.mean(axis=0), snapshots.var(axis=0), 
+            snapshots.min(axis=0), snapshots.max(axis=0), 
+            common.abs_max(snapshots), 
+        )
+
+    def online():
+        stats = common.RunningStats(n_points)
+        snapshot = np.empty(n_points)
+        for phase in phases:
+            stats.update(np.sin(x_arr + phase, out=snapshot))
+        return stats.mean, stats.var(), stats.min, stats.max, stats.abs_max
+
+    print(f'running statistics ({n_steps} steps x {n_points} points):')
+    for variant_label, func in [('stored', stored), ('online', online)]:
+        t, peak = measure(func)
+        record(f'running_stats/{variant_label}', t)
+        print(
+            f'  {variant_label:>6s} | {t * 1e3:7.1f} ms | '
+            + f'peak {peak / mb:6.1f} MB'
+        )
+
+
+def bench_animation(n_frames:int=300, n_points:int=1000):
+    """
+        Reports frames per minute of export_animation (to an encoder 
+        if one is installed, otherwise to PNG images) against 
+        rebuilding and saving the figure with build_plot per frame. 
+
+        --Parameters--
+        * n_frames : int, optional // 
+            Number of animation frames,  
+                * by default 300. 
+        * n_points : int, optional // 
+            Number of points per frame,  
+                * by default 1000. 
+    """    
+
+    x_arr = np.linspace(0, 2*np.pi, n_points)
+    t_arr = np.linspace(0, 2*np.pi, n_frames)
+    y_frames = np.sin(x_arr[None, :] - t_arr[:, None])
+    titles = [f't = {t:.2f}' for t in t_arr]
+    n_rebuilt = max(n_frames // 10, 1) # the slow path is sampled
+
+    print(f'animation ({n_frames} frames x {n_points} points):')
+    with tempfile.TemporaryDirectory() as out_dir:
+        def rebuilt():
+            for i in range(n_rebuilt):
+                common.build_plot(
+                    'anim', [x_arr], [y_frames[i]], plot_title=titles[i], 
+                    y_lim=[-1.1, 1.1], headless=True, 
+                    save_path=os.path.join(out_dir, f'frame_{i:06d}.png'), 
+                )
+            return n_rebuilt
+
+        def exported():
+            with warnings.catch_warnings():
+                warnings.simplefilter('ignore') # no encoder installed
+                common.export_animation(
+                    os.path.join(out_dir, 'anim.mp4'), x_arr, y_frames, 
+                    frame_titles=titles, y_lim=[-1.1, 1.1], 
+                )
+            return n_frames
+
+        for variant_label, func in [('rebuilt', rebuilt), ('exported', exported)]:
+            init_time = time.perf_counter()
+            n = func()
+            t = (time.perf_counter() - init_time) / n
+            record(f'animation/{variant_label}', t)
+            print(f'  {variant_label:>8s} | {60 / t:8.0f} frames/min')
+
+
+benchmarks = {
+    'abs_max': bench_abs_max, 
+    'reduce_arrays': bench_reduce_arrays, 
+    'export_plots': bench_export_plots, 
+    'decimation': bench_decimation, 
+    'progress': bench_progress, 
+    'time_stepping': bench_time_stepping, 
+    'replica_jobs': bench_replica_jobs, 
+    'import_time': bench_import_time, 
+    'timestring': bench_timestring, 
+    'abs_max_dtypes': bench_abs_max_dtypes, 
+    'build_plot': bench_build_plot, 
+    'grid': bench_grid, 
+    'shared_arrays': bench_shared_arrays, 
+    'plot_series': bench_plot_series, 
+    'running_stats': bench_running_stats, 
+    'animation': bench_animation, 
+}
+
+
+def begin():
+    """ 
+        Initial terminal housekeeping. 
+    """
+
+    logistics.housekeeping_initial(
+        ignore_warnings=True, 
+        filename=filename_main, 
+        location=location_main,
+        print_version= [True, False], 
+        dependencies=['numpy',  'matplotlib']
+    )
+
+
+def end():
+    """ 
+        Final terminal housekeeping.
+    """
+
+    logistics.housekeeping_final(
+        filename=filename_main, 
+        location=location_main,
+        print_timing=True,
+    )
+
+
+def parse_args():
+    """ 
+        Command-line options of the benchmark harness. 
+    """
+
+    parser = argparse.ArgumentParser(description=(
+        'Headless benchmark harness; save a baseline with '
+        '"python benchmark.py --output baseline.json", then check for '
+        'regressions with "python benchmark.py --baseline baseline.json" '
+        '(exits with a non-zero status on any regression).'
+    ))
+    parser.add_argument(
+        'names', nargs='*', 
+        help='benchmarks to run (by default all): ' + ', '.join(benchmarks)
+    )
+    parser.add_argument(
+        '--output', help='path of a JSON file for the recorded times'
+    )
+    parser.add_argument(
+        '--baseline', help='JSON file (from --output) to compare against'
+    )
+    parser.add_argument(
+        '--threshold', type=float, default=threshold, 
+        help='allowed slowdown against the baseline (fraction)'
+    )
+    
+    args = parser.parse_args()
+    unknown = [name for name in args.names if name not in benchmarks]
+    if unknown:
+        parser.error(f'unknown benchmarks: {", ".join(unknown)}')
+    
+    return args
+
+
+def main():
+    global threshold
+    args = parse_args()
+    threshold = args.threshold
+    begin()
+    """ --Top of Stack-- """
+    
+    for name in args.names or list(benchmarks):
+        benchmarks[name]()
+        print()
+
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(
+                {'python': sys.version, 'results': results}, 
+                file, indent=2
+            )
+    if args.baseline:
+        compare_to_baseline(args.baseline)
+
+    """ --Bottom of Stack-- """
+    end()
+    if failures:
+        sys.exit('failed: ' + ', '.join(failures))
+
+
+if __name__ == '__main__':
+    main()
@@ -1,15 +1,33 @@
-import numpy as np
-import matplotlib.pyplot as plt
+from __future__ import annotations
 import logistics
 import time
-from typing import List, Union
+import os
+import pickle
+import itertools
+import atexit
+from collections import deque
+from concurrent.futures import as_completed
+from typing import Iterable, List, NamedTuple, Tuple, Union
 
+# numpy is imported on first use; matplotlib inside the plot routines:
+np = logistics.lazy_import('numpy')
+
+
+if True:
+    # Axes reused by build_plot(headless=True):
+    headless_ax = None 
+
+# Names of shared-memory blocks owned by this process, i.e. shared 
+# or received but not yet opened (see share_array()):
+owned_blocks = set()
+    
 
 def replica_job(
     steps:int, 
     print_progress:bool=False, 
     print_time:bool=False,
-    time_full_str:bool=False 
+    time_full_str:bool=False, 
+    worker_progress:logistics.WorkerProgress=None, 
 ):
     """
         Dummy-job -- replica-loop with time.sleep(); 
@@ -38,6 +56,11 @@ def replica_job(
             hh:mm:ss.cs,
                 * only required if print_time == True, 
                 * by default False. 
+        * worker_progress : logistics.WorkerProgress, optional // 
+            Handle from a logistics.ProgressAggregator, for jobs run 
+            in parallel; if given, progress is posted to the 
+            aggregator and nothing is printed by the job itself, 
+                * by default None. 
     """    
     
     init_time = time.perf_counter()
@@ -45,25 +68,543 @@ def replica_job(
     
     for i in range(steps):
         time.sleep(0.1)
-        if print_progress:
+        if worker_progress:
+            worker_progress.update(i)
+        elif print_progress:
+            logistics.print_loop_progress(
+                index=i, index_max=steps-1, prefix=msg
+            )
+        else: 
+            print('\r' + msg, end='')
+    
+    buffer = ' ' * len(msg) if print_progress else ''
+    if print_time and not worker_progress:
+        logistics.print_time_required(
+            init_time=init_time, prefix=buffer,
+            full_str=time_full_str
+        )
+    
+
+async def replica_job_async(
+    steps:int, 
+    print_progress:bool=False, 
+    print_time:bool=False,
+    time_full_str:bool=False, 
+    on_step=None, 
+):
+    """
+        Asyncio variant of replica_job() -- replica-loop with 
+        asyncio.sleep(), standing in for jobs which wait on I/O 
+        or subprocesses; many of these can run concurrently in 
+        one thread (see run_replica_jobs()). 
+
+        --Parameters--
+        * steps : int // 
+            Number of replica-actions (sleeps) to be awaited. 
+        * print_progress : bool, optional // 
+            As for replica_job(),  
+                * by default False. 
+        * print_time : bool, optional // 
+            As for replica_job(),  
+                * by default False. 
+        * time_full_str : bool, optional // 
+            As for replica_job(),  
+                * by default False. 
+        * on_step : callable, optional // 
+            Called (without arguments) after each step; if given, 
+            the job prints nothing itself (for concurrent jobs), 
+                * by default None. 
+    """    
+    
+    import asyncio
+
+    init_time = time.perf_counter()
+    msg = 'replicating job, '
+    
+    for i in range(steps):
+        await asyncio.sleep(0.1)
+        if on_step:
+            on_step()
+        elif print_progress:
             logistics.print_loop_progress(
                 index=i, index_max=steps-1, prefix=msg
             )
         else: 
             print('\r' + msg, end='')
     
+    buffer = ' ' * len(msg) if print_progress else ''
+    if print_time and not on_step:
+        logistics.print_time_required(
+            init_time=init_time, prefix=buffer,
+            full_str=time_full_str
+        )
+
+
+def run_replica_jobs(
+    n_jobs:int, 
+    steps:int, 
+    max_concurrent:int=None, 
+    print_progress:bool=False, 
+    print_time:bool=False, 
+    time_full_str:bool=False, 
+):
+    """
+        Runs n_jobs asyncio replica jobs concurrently (at most 
+        max_concurrent at a time), so that the wall-clock time is 
+        about steps * 0.1 s rather than n_jobs * steps * 0.1 s; 
+        combined progress and timing are printed as for replica_job(). 
+
+        --Parameters--
+        * n_jobs : int // 
+            Number of replica jobs. 
+        * steps : int // 
+            Number of replica-actions (sleeps) per job. 
+        * max_concurrent : int, optional // 
+            Bound on the number of jobs running at once 
+            (enforced with an asyncio.Semaphore),  
+                * by default None (i.e. all jobs at once). 
+        * print_progress : bool, optional // 
+            Option to print the combined progress of all jobs 
+            using the logistics.print_loop_progress() routine,  
+                * by default False. 
+        * print_time : bool, optional // 
+            Option to print the time required for all jobs using 
+            the logistics.print_time_required() routine,  
+                * by default False. 
+        * time_full_str : bool, optional // 
+            Option to force the displayed time-string to be of the form:
+            hh:mm:ss.cs,
+                * only required if print_time == True, 
+                * by default False. 
+    """    
+
+    import asyncio
+
+    init_time = time.perf_counter()
+    msg = f'replicating {n_jobs} jobs, '
+    index_max = n_jobs * steps - 1
+    n_done = 0
+
+    def on_step():
+        nonlocal n_done
+        if print_progress:
+            logistics.print_loop_progress(
+                index=n_done, index_max=index_max, prefix=msg
+            )
+        n_done += 1
+
+    async def run_all():
+        semaphore = asyncio.Semaphore(max_concurrent or n_jobs)
+        async def run_one():
+            async with semaphore:
+                await replica_job_async(steps, on_step=on_step)
+        await asyncio.gather(*(run_one() for _ in range(n_jobs)))
+
+    if not print_progress:
+        print('\r' + msg, end='')
+    asyncio.run(run_all())
+
     buffer = ' ' * len(msg) if print_progress else ''
     if print_time:
         logistics.print_time_required(
             init_time=init_time, prefix=buffer,
             full_str=time_full_str
         )
+
+
+def expand_grid(param_grid:dict)->List[dict]:
+    """
+        Expands a parameter grid into the list of all its points. 
+
+        --Parameters--
+        * param_grid : dict // 
+            Maps each parameter name to a list of values, 
+            e.g. {'dx': [0.1, 0.05], 'dt': [0.1, 0.01]}. 
+
+        --Returns--
+        * points : List[dict] // 
+            One dict of parameter values per combination. 
+    """    
+
+    names = list(param_grid)
+    points = [
+        dict(zip(names, values)) 
+        for values in itertools.product(*param_grid.values())
+    ]
+
+    return points
+
+
+def _sweep_key(func, params:dict)->str:
+    """ 
+        Cache key of one sweep point: a hash of the function's 
+        qualified name and the parameter values, as for 
+        logistics.disk_cache (see logistics.hash_args). 
+    """
+
+    name = f'{func.__module__}.{func.__qualname__}'
+    
+    return logistics.hash_args(name, **params)
+
+
+def _run_sweep_chunk(func, chunk:List[Tuple[int, dict]])->List[Tuple]:
+    """ 
+        Runs func on each (index, params) pair of a chunk, 
+        inside a sweep worker. 
+    """
+
+    return [(index, func(**params)) for index, params in chunk]
+
+
+def run_sweep(
+    func, 
+    param_grid:dict, 
+    workers:int=None, 
+    chunk_size:int=1, 
+    cache_dir:str=None, 
+    prefix:str='sweep, ', 
+    print_time:bool=True, 
+)->List:
+    """
+        Runs func at every point of a parameter grid (e.g. over 
+        config's dx, dt and x_max) in a process pool; finished 
+        points are cached on disk, keyed by a hash of func and 
+        the parameters, so that reruns skip them. Progress and 
+        timing are reported through the logistics helpers. 
+
+        --Parameters--
+        * func : callable // 
+            Module-level (i.e. picklable) function, called as 
+            func(**params) for each point. 
+        * param_grid : dict // 
+            Maps each parameter name to a list of values 
+            (see expand_grid()). 
+        * workers : int, optional // 
+            Number of worker processes,  
+                * by default None (i.e. os.cpu_count()). 
+        * chunk_size : int, optional // 
+            Number of points sent to a worker at once,  
+                * by default 1. 
+        * cache_dir : str, optional // 
+            Directory of cached results (created if needed),  
+                * by default None (no caching). 
+        * prefix : str, optional // 
+            Gets printed just before the displayed progress,  
+                * by default 'sweep, '. 
+        * print_time : bool, optional // 
+            Option to print the time required by the sweep,  
+                * by default True. 
+
+        --Returns--
+        * results : List // 
+            Results of func, in the order of expand_grid(param_grid). 
+    """    
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    init_time = time.perf_counter()
+    points = expand_grid(param_grid)
+    results = [None] * len(points)
+    
+    pending = []
+    paths = {}
+    if cache_dir:
+        os.makedirs(cache_dir, exist_ok=True)
+    for index, params in enumerate(points):
+        if cache_dir:
+            paths[index] = os.path.join(
+                cache_dir, _sweep_key(func, params) + '.pkl'
+            )
+            if os.path.exists(paths[index]):
+                with open(paths[index], 'rb') as file:
+                    results[index] = pickle.load(file)
+                continue
+        pending.append((index, params))
+
+    chunks = [
+        pending[i:i + chunk_size] 
+        for i in range(0, len(pending), chunk_size)
+    ]
+    reporter = logistics.ProgressReporter(len(pending), prefix=prefix)
+    reporter.update(0)
+    n_done = 0
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(_run_sweep_chunk, func, chunk) 
+            for chunk in chunks
+        ]
+        for future in as_completed(futures):
+            for index, result in future.result():
+                results[index] = result
+                if cache_dir:
+                    tmp_path = paths[index] + '.tmp'
+                    with open(tmp_path, 'wb') as file:
+                        pickle.dump(result, file)
+                    os.replace(tmp_path, paths[index])
+                n_done += 1
+            reporter.update(n_done)
+    reporter.close()
+
+    if print_time:
+        logistics.print_time_required(
+            init_time=init_time, prefix=' ' * len(prefix)
+        )
     
+    return results
+
+
+class SeriesStyle:
+    """
+        Style record of one series within a PlotSeries; 
+        fields left as None fall back to build_plot's defaults. 
+
+        --Fields--
+        * label : str // 
+            Legend label. 
+        * linestyle : str // 
+            Matplotlib linestyle. 
+        * color : str // 
+            Matplotlib color. 
+        * marker : str // 
+            Matplotlib marker style. 
+    """    
+
+    __slots__ = ('label', 'linestyle', 'color', 'marker')
+
+    def __init__(
+        self, 
+        label:str=None, 
+        linestyle:str=None, 
+        color:str=None, 
+        marker:str=None, 
+    ):
+        self.label = label
+        self.linestyle = linestyle
+        self.color = color
+        self.marker = marker
+
+    def __repr__(self)->str:
+        fields = ', '.join(
+            f'{name}={getattr(self, name)!r}' for name in self.__slots__
+        )
+        return f'SeriesStyle({fields})'
+
+
+class PlotSeries:
+    """
+        Compact collection of (x, y) series for build_plot(); 
+        all values are stored in two contiguous buffers (grown 
+        geometrically, so appends are amortised O(1)), a series 
+        appended without x reuses the previous series' x values 
+        rather than copying them, and styles are kept as 
+        SeriesStyle records. The arrays handed out (x_arrs, 
+        y_arrs, y_data, etc.) are views into the buffers, so 
+        they should be taken after the last append. 
+
+        --Parameters--
+        * dtype : np.dtype, optional // 
+            Data type of the stored values,  
+                * by default np.float64. 
+        * capacity : int, optional // 
+            Initial number of values reserved in each buffer,  
+                * by default 1024. 
+    """    
+
+    __slots__ = (
+        'dtype', '_x_buf', '_y_buf', '_x_len', '_y_len', 
+        '_bounds', '_n_series', 'styles', 
+    )
+
+    def __init__(self, dtype=None, capacity:int=1024):
+        self.dtype = np.dtype(np.float64 if dtype is None else dtype)
+        self._x_buf = np.empty(capacity, dtype=self.dtype)
+        self._y_buf = np.empty(capacity, dtype=self.dtype)
+        self._x_len = self._y_len = 0
+        # (x offset, y offset, length) of each series:
+        self._bounds = np.empty((16, 3), dtype=np.int64)
+        self._n_series = 0
+        self.styles = []
+
+    @classmethod
+    def from_arrays(
+        cls, 
+        x_arrs:List[List[float]], 
+        y_arrs:List[List[float]], 
+        plot_labels:List[str]=None, 
+        linestyles:List[str]=None, 
+        plot_colors:List[str]=None, 
+        plot_markers:List[str]=None, 
+        dtype=None, 
+    )->PlotSeries:
+        """
+            Builds a collection from build_plot-style parallel lists 
+            (consecutive series sharing the same x object store 
+            their x values only once). 
+
+            --Parameters--
+            * x_arrs, y_arrs, plot_labels, linestyles, plot_colors, 
+              plot_markers // 
+                As for build_plot(). 
+            * dtype : np.dtype, optional // 
+                Data type of the stored values,  
+                    * by default np.float64. 
+
+            --Returns--
+            * series : PlotSeries // 
+                The new collection. 
+        """    
+
+        n_values = sum(len(y_arr) for y_arr in y_arrs)
+        series = cls(dtype=dtype, capacity=max(n_values, 1))
+        prev_x = None
+        for i, (x_arr, y_arr) in enumerate(zip(x_arrs, y_arrs)):
+            series.append(
+                y_arr, 
+                x_arr=None if x_arr is prev_x else x_arr, 
+                label=plot_labels[i] if plot_labels else None, 
+                linestyle=linestyles[i] if linestyles else None, 
+                color=plot_colors[i] if plot_colors else None, 
+                marker=plot_markers[i] if plot_markers else None, 
+            )
+            prev_x = x_arr
+        
+        return series
+
+    @staticmethod
+    def _reserve(buf:np.ndarray, used:int, extra:int)->np.ndarray:
+        """ 
+            Returns buf, or a copy of it with (at least) doubled 
+            capacity along axis 0 if extra more rows do not fit. 
+        """
+
+        if used + extra <= len(buf):
+            return buf
+        new_buf = np.empty(
+            (max(2 * len(buf), used + extra),) + buf.shape[1:], 
+            dtype=buf.dtype
+        )
+        new_buf[:used] = buf[:used]
+        
+        return new_buf
+
+    def append(
+        self, 
+        y_arr:List[float], 
+        x_arr:List[float]=None, 
+        label:str=None, 
+        linestyle:str=None, 
+        color:str=None, 
+        marker:str=None, 
+    ):
+        """
+            Appends a series (copying its values into the buffers). 
+
+            --Parameters--
+            * y_arr : List[float] // 
+                Vertical-axis values. 
+            * x_arr : List[float], optional // 
+                Horizontal-axis values,  
+                    * by default None (i.e. those of the previous 
+                      series, which must have the same length, or 
+                      0, 1, 2, ... for the first series). 
+            * label, linestyle, color, marker : str, optional // 
+                Style of the series (see SeriesStyle),  
+                    * by default None. 
+        """    
+
+        y_arr = np.asarray(y_arr).ravel()
+        n = len(y_arr)
+        if x_arr is None and self._n_series:
+            x_start, _, prev_n = self._bounds[self._n_series - 1]
+            if prev_n != n:
+                raise ValueError(
+                    f'series of length {n} cannot reuse the previous '
+                    f'x values (length {prev_n})'
+                )
+        else:
+            x_arr = np.arange(n) if x_arr is None \
+                else np.asarray(x_arr).ravel()
+            if len(x_arr) != n:
+                raise ValueError(
+                    f'x ({len(x_arr)} values) and y ({n} values) '
+                    'differ in length'
+                )
+            self._x_buf = self._reserve(self._x_buf, self._x_len, n)
+            x_start = self._x_len
+            self._x_buf[x_start:x_start + n] = x_arr
+            self._x_len += n
+
+        self._y_buf = self._reserve(self._y_buf, self._y_len, n)
+        y_start = self._y_len
+        self._y_buf[y_start:y_start + n] = y_arr
+        self._y_len += n
+
+        self._bounds = self._reserve(self._bounds, self._n_series, 1)
+        self._bounds[self._n_series] = x_start, y_start, n
+        self._n_series += 1
+        self.styles.append(SeriesStyle(label, linestyle, color, marker))
+
+    def __len__(self)->int:
+        return self._n_series
+
+    def __getitem__(self, i:int)->Tuple[np.ndarray, np.ndarray]:
+        """ 
+            Views of the x and y values of series i. 
+        """
+
+        if not -self._n_series <= i < self._n_series:
+            raise IndexError('series index out of range')
+        x_start, y_start, n = self._bounds[i % self._n_series]
+        
+        return (
+            self._x_buf[x_start:x_start + n], 
+            self._y_buf[y_start:y_start + n], 
+        )
+
+    @property
+    def x_arrs(self)->List[np.ndarray]:
+        """ Views of the x values of every series. """
+        return [self[i][0] for i in range(self._n_series)]
+
+    @property
+    def y_arrs(self)->List[np.ndarray]:
+        """ Views of the y values of every series. """
+        return [self[i][1] for i in range(self._n_series)]
+
+    @property
+    def y_data(self)->np.ndarray:
+        """ 
+            Contiguous view of all y values (e.g. for abs_max). 
+        """
+        return self._y_buf[:self._y_len]
+
+    @property
+    def x_data(self)->np.ndarray:
+        """ 
+            Contiguous view of all (distinct) x values. 
+        """
+        return self._x_buf[:self._x_len]
+
+    @property
+    def nbytes(self)->int:
+        """ Number of bytes of stored values (excluding spare capacity). """
+        return (self._x_len + self._y_len) * self.dtype.itemsize
+
+    def trim(self):
+        """ 
+            Releases the buffers' spare capacity (after which 
+            previously obtained views no longer alias the buffers). 
+        """
+
+        self._x_buf = self._x_buf[:self._x_len].copy()
+        self._y_buf = self._y_buf[:self._y_len].copy()
+        self._bounds = self._bounds[:self._n_series].copy()
+
 
 def build_plot(
     fig_label :       str                               ,
-    x_arrs :          List[List[float]]                 ,
-    y_arrs :          List[List[float]]                 ,
+    x_arrs :          Union[List, PlotSeries]           ,
+    y_arrs :          List[List[float]]     = None      ,
 
     plot_labels :     List[str]             = None      ,
     fig_loc :         List[float]           = [600, 250],
@@ -79,22 +620,34 @@ def build_plot(
     grid:             Union[bool, List]     = False     , 
     y_lim :           List[float]           = None      ,
     x_lim :           List[float]           = None      ,   
+    headless :        Union[bool, str]      = False     ,
+    save_path :       str                   = None      ,
+    dpi :             float                 = 100       ,
+    max_points :      int                   = None      ,
+    decimation :      str                   = 'minmax'  ,
 ):
     """
         Builds a plot using matplotlib.pyplot;
         "plt.show()" must be called elsewhere,
+        unless headless == True (in which case a single, reused 
+        Figure which is not managed by pyplot is drawn on, 
+        and the plot should be written to disk via save_path).
 
         --Parameters--
         * fig_label : str // 
             Title of the figure.
-        * x_arrs : List[List[float]] // 
+        * x_arrs : Union[List[List[float]], PlotSeries] // 
             Arrays (arranged along axis 0) 
             containing horizontal-axis values for points to be plotted; 
             each array in x_arrs should have exactly one counterpart
             in y_arrs. 
-        * y_arrs : List[List[float]] // 
+            Can also be a PlotSeries, which supplies both the values 
+            and (where not given explicitly below) the styles. 
+        * y_arrs : List[List[float]], optional // 
             Arrays (arranged along axis 0) 
             containing vertical-axis values for points to be plotted; 
+                * only required if x_arrs is not a PlotSeries, 
+                * by default None. 
         * plot_labels : List[str], optional // 
             Ordered labels for each plot 
             (i.e. each pair of x, y arrays). 
@@ -155,26 +708,77 @@ def build_plot(
             List containing two floats--gives the horizontal 
             plot boundaries,  
                 * by default None. 
+        * headless : Union[bool, str], optional // 
+            Option to draw without any GUI window (e.g. on cluster 
+            nodes); the figure size becomes fig_size / dpi (in inches), 
+            fig_loc is ignored, and one Figure/Axes pair is cleared 
+            and reused across calls, so no figures accumulate; 
+            can also be set as 'new' to draw on a Figure of its own 
+            instead (which is kept by the caller, e.g. LivePlot),  
+                * by default False. 
+        * save_path : str, optional // 
+            Path to which the figure is written; the format 
+            (e.g. png, svg, pdf) is inferred from the extension,  
+                * by default None. 
+        * dpi : float, optional // 
+            Resolution (in px per inch) of the headless 
+            figure and of the saved file,  
+                * by default 100. 
+        * max_points : int, optional // 
+            Option to decimate every series with more than 
+            max_points points down to max_points points before 
+            plotting (see decimate_series); about twice the 
+            figure width in px keeps the plot visually unchanged,  
+                * by default None (no decimation). 
+        * decimation : str, optional // 
+            Decimation method, either 'minmax' or 'lttb',  
+                * only required if max_points is given, 
+                * by default 'minmax'. 
+
+        --Returns--
+        * ax : matplotlib.axes.Axes // 
+            The axes which were drawn on. 
     """    
     
-    plt.figure(fig_label)
-
     # Window geometry (type:int, units:px):
     fig_x_pos, fig_y_pos = fig_loc
     fig_width, fig_height = fig_size 
-    mgr = plt.get_current_fig_manager()
-    mgr.window.setGeometry(
-        fig_x_pos, fig_y_pos, fig_width, fig_height
-    )
+    if headless:
+        ax = _headless_axes(fresh=headless == 'new')
+        ax.figure.set_size_inches(fig_width / dpi, fig_height / dpi)
+        ax.figure.set_dpi(dpi)
+    else:
+        import matplotlib.pyplot as plt
+        fig = plt.figure(fig_label)
+        ax = fig.gca()
+        mgr = plt.get_current_fig_manager()
+        window = getattr(mgr, 'window', None)
+        if hasattr(window, 'setGeometry'): # Qt backends only
+            window.setGeometry(
+                fig_x_pos, fig_y_pos, fig_width, fig_height
+            )
+
+    # Series values and styles:
+    if isinstance(x_arrs, PlotSeries):
+        series = x_arrs
+        x_arrs, y_arrs = series.x_arrs, series.y_arrs
+        styles = series.styles
+    else:
+        styles = [SeriesStyle()] * len(y_arrs)
 
     # Main plot call:
-    for i in range(len(y_arrs)):
-        label = plot_labels[i] if plot_labels else None
-        linestyle = linestyles[i] if linestyles else '-'
-        color = plot_colors[i] if plot_colors else f'C{i}'
-        marker = plot_markers[i] if plot_markers else None
-        plt.plot(
-            x_arrs[i], y_arrs[i], 
+    for i, style in enumerate(styles):
+        label = plot_labels[i] if plot_labels else style.label
+        linestyle = linestyles[i] if linestyles else style.linestyle or '-'
+        color = plot_colors[i] if plot_colors else style.color or f'C{i}'
+        marker = plot_markers[i] if plot_markers else style.marker
+        x_arr, y_arr = x_arrs[i], y_arrs[i]
+        if max_points:
+            x_arr, y_arr = decimate_series(
+                x_arr, y_arr, max_points, method=decimation
+            )
+        ax.plot(
+            x_arr, y_arr, 
             label=label,
             linestyle=linestyle,
             color=color, 
@@ -182,45 +786,1049 @@ def build_plot(
         )
     
     # labels:
-    plt.xlabel(x_label)
-    plt.ylabel(y_label)
-    plt.title(plot_title)
+    ax.set_xlabel(x_label)
+    ax.set_ylabel(y_label)
+    ax.set_title(plot_title)
 
     # options
     if legend:
         legend_loc = legend[1] \
             if type(legend) == list else 'best'
-        plt.legend(loc=legend_loc)
+        ax.legend(loc=legend_loc)
     if grid:
         opacity = grid[1] \
             if type(grid) == list else 0.3
-        plt.grid(alpha=opacity)
+        ax.grid(alpha=opacity)
     if axes:
         axes_linestyle = axes[1] \
             if type(axes) == list else '--'
         axes_color = axes[2] \
             if type(axes) == list else 'k'
-        plt.axhline(
+        ax.axhline(
             0, linestyle=axes_linestyle, color=axes_color
         )
-        plt.axvline(
+        ax.axvline(
             0, linestyle=axes_linestyle, color=axes_color
         )
     if x_lim:
-        plt.xlim(x_lim[0], x_lim[1])
+        ax.set_xlim(x_lim[0], x_lim[1])
     if y_lim:
-        plt.ylim(y_lim[0], y_lim[1])
+        ax.set_ylim(y_lim[0], y_lim[1])
+    
+    if save_path:
+        ax.figure.savefig(save_path, dpi=dpi)
+
+    return ax
+
+
+class LivePlot:
+    """
+        Live-updating plot for long-running loops; the figure is 
+        built once with build_plot(), after which update() only 
+        swaps the line data in place and redraws through blitting, 
+        at no more than max_fps frames per second and taking no 
+        more than (roughly) max_fraction of the loop's time. 
+
+        --Parameters--
+        * fig_label : str // 
+            Title of the figure. 
+        * x_arrs : Union[List[List[float]], PlotSeries] // 
+            Initial horizontal-axis arrays, or a PlotSeries 
+            (as for build_plot). 
+        * y_arrs : List[List[float]], optional // 
+            Initial vertical-axis arrays (as for build_plot),  
+                * by default None. 
+        * max_fps : float, optional // 
+            Upper bound on redraws per second,  
+                * by default 10. 
+        * max_fraction : float, optional // 
+            Upper bound on the fraction of wall-clock time spent 
+            redrawing (measured from the previous redraws),  
+                * by default 0.1. 
+        * autoscale : bool, optional // 
+            Option to rescale the axes (with a full redraw) 
+            whenever the data leaves the current limits,  
+                * by default True. 
+        * **plot_kwargs // 
+            Styling options passed on to build_plot(); with 
+            headless=True the figure is drawn off-screen on an Agg 
+            canvas of its own (e.g. for periodic savefig calls), 
+            which neither pyplot nor other headless plots touch. 
+    """    
+
+    def __init__(
+        self, 
+        fig_label:str, 
+        x_arrs:Union[List, PlotSeries], 
+        y_arrs:List[List[float]]=None, 
+        max_fps:float=10, 
+        max_fraction:float=0.1, 
+        autoscale:bool=True, 
+        **plot_kwargs, 
+    ):
+        headless = plot_kwargs.get('headless')
+        if headless: # not the Figure shared by other headless plots
+            plot_kwargs['headless'] = 'new'
+        self.ax = build_plot(fig_label, x_arrs, y_arrs, **plot_kwargs)
+        n_series = len(x_arrs if y_arrs is None else y_arrs)
+        self.fig = self.ax.figure
+        self.canvas = self.fig.canvas
+        self.min_interval = 1 / max_fps
+        self.max_fraction = max_fraction
+        self.autoscale = autoscale
+        
+        # Data lines precede the (optional) two axes lines:
+        n_axes = 2 if plot_kwargs.get('axes') else 0
+        n_lines = len(self.ax.lines)
+        self.lines = self.ax.lines[
+            n_lines - n_axes - n_series : n_lines - n_axes
+        ]
+        for line in self.lines:
+            line.set_animated(True)
+
+        self.blit = self.canvas.supports_blit
+        self.background = None
+        self.draw_time = 0
+        self.last_draw = -np.inf
+        self.draw_cid = self.canvas.mpl_connect('draw_event', self._on_draw)
+        if not headless: # would show every other open pyplot figure
+            import matplotlib.pyplot as plt
+            plt.show(block=False)
+        self.canvas.draw()
+        self.canvas.flush_events()
+
+    def _on_draw(self, event):
+        """ 
+            Recaptures the background after any full redraw 
+            (e.g. a window resize), then draws the lines on top. 
+        """
+
+        if self.blit:
+            self.background = self.canvas.copy_from_bbox(self.fig.bbox)
+        for line in self.lines:
+            self.ax.draw_artist(line)
 
+    def _out_of_bounds(self)->bool:
+        """ 
+            Checks whether any line extends beyond the current limits. 
+        """
+
+        x_lo, x_hi = sorted(self.ax.get_xlim())
+        y_lo, y_hi = sorted(self.ax.get_ylim())
+        for line in self.lines:
+            x_arr, y_arr = line.get_xdata(), line.get_ydata()
+            if len(x_arr) and (
+                np.min(x_arr) < x_lo or np.max(x_arr) > x_hi
+                or np.min(y_arr) < y_lo or np.max(y_arr) > y_hi
+            ):
+                return True
+        
+        return False
+
+    def update(
+        self, 
+        y_arrs:List[List[float]], 
+        x_arrs:List[List[float]]=None, 
+        force:bool=False, 
+    )->bool:
+        """
+            Replaces the data of each line, redrawing only if 
+            the frame-rate and time-fraction budgets allow it. 
+
+            --Parameters--
+            * y_arrs : List[List[float]] // 
+                New vertical-axis arrays (one per line). 
+            * x_arrs : List[List[float]], optional // 
+                New horizontal-axis arrays,  
+                    * by default None (i.e. unchanged). 
+            * force : bool, optional // 
+                Option to redraw regardless of the budgets,  
+                    * by default False. 
+
+            --Returns--
+            * drawn : bool // 
+                Whether the figure was redrawn. 
+        """    
+
+        for i, line in enumerate(self.lines):
+            if x_arrs is None:
+                line.set_ydata(y_arrs[i])
+            else:
+                line.set_data(x_arrs[i], y_arrs[i])
+
+        # Idle time between draws which keeps drawing within budget:
+        interval = max(
+            self.min_interval, 
+            self.draw_time * (1 / self.max_fraction - 1)
+        )
+        now = time.perf_counter()
+        if not force and now - self.last_draw - self.draw_time < interval:
+            return False
 
-def abs_max(arrs:List)->float:
+        if self.autoscale and self._out_of_bounds():
+            self.ax.relim()
+            self.ax.autoscale_view()
+            self.canvas.draw() # full redraw (recaptures background)
+        elif self.blit and self.background is not None:
+            self.canvas.restore_region(self.background)
+            for line in self.lines:
+                self.ax.draw_artist(line)
+            self.canvas.blit(self.fig.bbox)
+        else:
+            self.canvas.draw()
+        self.canvas.flush_events()
+
+        self.last_draw = now
+        self.draw_time = time.perf_counter() - now
+        
+        return True
+
+    def finish(self):
+        """ 
+            Draws the latest data and returns the lines to normal 
+            (non-animated) artists, so that plt.show() displays them. 
+        """
+
+        for line in self.lines:
+            line.set_animated(False)
+        self.blit = False
+        self.canvas.mpl_disconnect(self.draw_cid)
+        if self.autoscale:
+            self.ax.relim()
+            self.ax.autoscale_view()
+        self.canvas.draw()
+        self.canvas.flush_events()
+
+
+def _minmax_indices(y_arr:np.ndarray, n_out:int)->np.ndarray:
+    """
+        Indices of the minimum and maximum of each of (n_out - 2) // 2 
+        equally-sized buckets (in their original order), 
+        for decimate_series(). 
+    """    
+
+    n = len(y_arr)
+    n_buckets = max((n_out - 2) // 2, 1) # endpoints are kept as well
+    bucket = -(-n // n_buckets) # ceiling division
+    n_full = n // bucket
+    
+    # Full buckets are reduced as rows of a 2D view:
+    rows = y_arr[:n_full * bucket].reshape(n_full, bucket)
+    starts = np.arange(n_full) * bucket
+    i_min = starts + rows.argmin(axis=1)
+    i_max = starts + rows.argmax(axis=1)
+    pairs = [np.sort(np.stack([i_min, i_max], axis=1), axis=1).ravel()]
+    if n_full * bucket < n: # remainder bucket
+        tail = y_arr[n_full * bucket:]
+        start = n_full * bucket
+        pairs.append(np.sort([start + tail.argmin(), start + tail.argmax()]))
+    
+    return np.unique(np.concatenate([[0], *pairs, [n - 1]]))
+
+
+def _lttb_indices(
+    x_arr:np.ndarray, y_arr:np.ndarray, n_out:int
+)->np.ndarray:
+    """
+        Indices selected by the largest-triangle-three-buckets 
+        algorithm, for decimate_series(); bucket means are 
+        vectorized, leaving one short python loop over buckets. 
+    """    
+
+    n = len(y_arr)
+    x_arr = x_arr.astype(np.float64, copy=False)
+    y_arr = y_arr.astype(np.float64, copy=False)
+
+    # Inner points (excluding first/last) split into n_out - 2 buckets:
+    edges = 1 + (np.arange(n_out - 1) * (n - 2) // (n_out - 2))
+    counts = np.diff(edges)
+    x_means = np.add.reduceat(x_arr[:-1], edges[:-1]) / counts
+    y_means = np.add.reduceat(y_arr[:-1], edges[:-1]) / counts
+    x_means = np.append(x_means[1:], x_arr[-1])
+    y_means = np.append(y_means[1:], y_arr[-1])
+
+    indices = np.empty(n_out, dtype=np.intp)
+    indices[0], indices[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        areas = np.abs(
+            (x_arr[a] - x_means[i]) * (y_arr[lo:hi] - y_arr[a])
+            - (x_arr[a] - x_arr[lo:hi]) * (y_means[i] - y_arr[a])
+        )
+        a = lo + int(areas.argmax())
+        indices[i + 1] = a
+
+    return indices
+
+
+def decimate_series(
+    x_arr:List[float], 
+    y_arr:List[float], 
+    n_out:int, 
+    method:str='minmax', 
+)->Tuple[np.ndarray, np.ndarray]:
+    """
+        Reduces a series to about n_out points, while keeping its 
+        visible peaks; x_arr should be sorted (as for a line plot). 
+
+        --Parameters--
+        * x_arr : List[float] // 
+            Horizontal-axis values of the series. 
+        * y_arr : List[float] // 
+            Vertical-axis values of the series. 
+        * n_out : int // 
+            Target number of points (at least 3); series which 
+            are already this short are returned unchanged. 
+        * method : str, optional // 
+            'minmax' keeps the minimum and maximum of each of 
+            n_out/2 buckets (fastest; exact envelope), 
+            'lttb' keeps the point of each of n_out buckets 
+            forming the largest triangle with its neighbours 
+            (largest-triangle-three-buckets; smoother shape),  
+                * by default 'minmax'. 
+
+        --Returns--
+        * x_out, y_out : Tuple[np.ndarray, np.ndarray] // 
+            The decimated series. 
+    """    
+
+    x_arr, y_arr = np.asarray(x_arr), np.asarray(y_arr)
+    n_out = max(n_out, 3)
+    if len(y_arr) <= n_out:
+        return x_arr, y_arr
+
+    if method == 'minmax':
+        indices = _minmax_indices(y_arr, n_out)
+    elif method == 'lttb':
+        indices = _lttb_indices(x_arr, y_arr, n_out)
+    else:
+        raise ValueError(f"unknown decimation method: '{method}'")
+
+    return x_arr[indices], y_arr[indices]
+
+
+def _headless_axes(fresh:bool=False):
+    """
+        Returns the (cleared) Axes of the Figure reused by 
+        build_plot(headless=True); the Figure is created on first 
+        use and is never registered with pyplot, so it cannot leak. 
+
+        --Parameters--
+        * fresh : bool, optional // 
+            Option to return the Axes of a new Figure (with an Agg 
+            canvas) instead, which is not reused by later calls,  
+                * by default False. 
+
+        --Returns--
+        * ax : matplotlib.axes.Axes // 
+            Empty axes, ready to be drawn on. 
+    """    
+    
+    global headless_ax
+    if fresh:
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from matplotlib.figure import Figure
+        fig = Figure()
+        FigureCanvasAgg(fig)
+        return fig.add_subplot()
+    if headless_ax is None:
+        from matplotlib.figure import Figure
+        headless_ax = Figure().add_subplot()
+    else:
+        headless_ax.clear()
+
+    return headless_ax
+
+
+def _init_plot_worker():
+    """
+        Per-process initializer for export_plots(); selects the 
+        non-interactive Agg backend, so that workers never 
+        attempt to open a GUI, and loads the headless figure 
+        ahead of the first spec. 
+    """    
+
+    import matplotlib
+    matplotlib.use('Agg')
+    _headless_axes()
+
+
+def _export_plot(item:Tuple[int, dict])->Tuple[int, str]:
+    """
+        Renders a single plot spec for export_plots(). 
+
+        --Parameters--
+        * item : Tuple[int, dict] // 
+            (index of the spec, spec). 
+
+        --Returns--
+        * out : Tuple[int, str] // 
+            (index of the spec, path of the written file). 
+    """    
+
+    index, spec = item
+    build_plot(**{**spec, 'headless': True})
+
+    return index, spec['save_path']
+
+
+def export_plots(
+    specs:List[dict], 
+    workers:int=None, 
+):
+    """
+        Renders many plots to disk in parallel, using a 
+        process pool in which each worker reuses the headless 
+        figure of build_plot(); results are yielded as each 
+        figure finishes (i.e. not necessarily in order). 
+
+        --Parameters--
+        * specs : List[dict] // 
+            Keyword arguments for build_plot(), one dict per figure; 
+            each must contain save_path (headless is always True, 
+            and overrides any headless key of a spec). 
+        * workers : int, optional // 
+            Number of worker processes; workers == 1 renders 
+            serially in the current process,  
+                * by default None (i.e. os.cpu_count()). 
+
+        --Yields--
+        * index, save_path : int, str // 
+            Position of the finished spec within specs, and the 
+            path of the file which was written. 
+    """    
+
+    workers = workers or os.cpu_count()
+    items = list(enumerate(specs))
+
+    if workers == 1:
+        for item in items:
+            yield _export_plot(item)
+        return
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_plot_worker
+    ) as executor:
+        futures = [executor.submit(_export_plot, item) for item in items]
+        for future in as_completed(futures):
+            yield future.result()
+
+
+class _FrameRenderer:
+    """
+        Figure for export_animation(), set up once with build_plot() 
+        (drawn headless on an Agg canvas); each frame then restores 
+        the cached background and redraws only the lines (and the 
+        title, if frames are titled). 
+
+        --Parameters--
+        * x_arr : np.ndarray // 
+            Horizontal-axis values shared by all series. 
+        * first_frame : np.ndarray // 
+            Values of the first frame, of shape (n_x) or (n_series, n_x). 
+        * titled : bool // 
+            Whether the title changes from frame to frame. 
+        * plot_kwargs : dict // 
+            Options for build_plot() (including fig_label). 
+    """    
+
+    def __init__(
+        self, 
+        x_arr:np.ndarray, 
+        first_frame:np.ndarray, 
+        titled:bool, 
+        plot_kwargs:dict, 
+    ):
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+        series = _frame_series(first_frame)
+        self.ax = build_plot(
+            x_arrs=[x_arr] * len(series), y_arrs=list(series), 
+            headless=True, **plot_kwargs
+        )
+        self.canvas = FigureCanvasAgg(self.ax.figure)
+        n_axes = 2 if plot_kwargs.get('axes') else 0
+        n_lines = len(self.ax.lines)
+        self.lines = self.ax.lines[
+            n_lines - n_axes - len(series) : n_lines - n_axes
+        ]
+        self.artists = list(self.lines) + ([self.ax.title] if titled else [])
+        for artist in self.artists:
+            artist.set_animated(True)
+        self.canvas.draw()
+        self.background = self.canvas.copy_from_bbox(self.ax.figure.bbox)
+        self.size = self.canvas.get_width_height() # (width, height) in px
+
+    def render(self, frame:np.ndarray, title:str=None)->memoryview:
+        """ 
+            Draws one frame, returning the canvas' RGBA buffer 
+            (overwritten by the next frame). 
+        """
+
+        self.canvas.restore_region(self.background)
+        for line, y_arr in zip(self.lines, _frame_series(frame)):
+            line.set_ydata(y_arr)
+        if title is not None:
+            self.ax.title.set_text(title)
+        for artist in self.artists:
+            self.ax.draw_artist(artist)
+        
+        return self.canvas.buffer_rgba()
+
+    def close(self):
+        """ 
+            Returns the reused headless figure to its normal state. 
+        """
+
+        for artist in self.artists:
+            artist.set_animated(False)
+
+
+def _frame_series(frame:np.ndarray)->np.ndarray:
+    """ 
+        A frame's values as an array of shape (n_series, n_x). 
+    """
+
+    frame = np.asarray(frame)
+    
+    return frame.reshape(-1, frame.shape[-1])
+
+
+def _encoder_command(
+    encoder:str, 
+    path:str, 
+    size:Tuple[int, int], 
+    fps:float, 
+    encoder_args:List[str], 
+)->List[str]:
+    """ 
+        ffmpeg-style command which reads raw RGBA frames of the 
+        given size from stdin and encodes them to path. 
+    """
+
+    if encoder_args is None:
+        encoder_args = []
+        if os.path.splitext(path)[1].lower() in ('.mp4', '.mov', '.mkv'):
+            # widely playable H.264 requires even dimensions:
+            encoder_args = [
+                '-pix_fmt', 'yuv420p', 
+                '-vf', 'pad=ceil(iw/2)*2:ceil(ih/2)*2', 
+            ]
+
+    return [
+        encoder, '-y', '-loglevel', 'error', 
+        '-f', 'rawvideo', '-pix_fmt', 'rgba', 
+        '-s', f'{size[0]}x{size[1]}', '-r', f'{fps}', '-i', '-', 
+        '-an', *encoder_args, path, 
+    ]
+
+
+def _render_animation_chunk(item:dict)->List[str]:
+    """
+        Renders a contiguous range of frames for export_animation(), 
+        either into one video file (through an encoder pipe) 
+        or as numbered PNG images. 
+
+        --Parameters--
+        * item : dict // 
+            Frame values (or the path of a .npy file and the frame 
+            range), titles, output options and plot options, 
+            as assembled by export_animation(). 
+
+        --Returns--
+        * paths : List[str] // 
+            Paths of the written files. 
+    """    
+
+    start, stop = item['frame_range']
+    frames = item['frames']
+    if isinstance(frames, (str, os.PathLike)):
+        frames = np.load(frames, mmap_mode='r')[start:stop]
+    titles = item['titles']
+    renderer = _FrameRenderer(
+        item['x_arr'], frames[0], titles is not None, item['plot_kwargs']
+    )
+
+    paths = []
+    try:
+        if item['encoder']:
+            import subprocess
+            command = _encoder_command(
+                item['encoder'], item['path'], renderer.size, 
+                item['fps'], item['encoder_args']
+            )
+            process = subprocess.Popen(command, stdin=subprocess.PIPE)
+            try:
+                for i, frame in enumerate(frames):
+                    process.stdin.write(
+                        renderer.render(
+                            frame, None if titles is None else titles[i]
+                        )
+                    )
+            finally:
+                process.stdin.close()
+                if process.wait():
+                    raise RuntimeError(
+                        f'{item["encoder"]} exited with status '
+                        f'{process.returncode}'
+                    )
+            paths.append(item['path'])
+        else:
+            from PIL import Image
+            root = os.path.splitext(item['path'])[0]
+            for i, frame in enumerate(frames):
+                buf = renderer.render(
+                    frame, None if titles is None else titles[i]
+                )
+                path = f'{root}_{start + i:06d}.png'
+                Image.frombuffer(
+                    'RGBA', renderer.size, buf, 'raw', 'RGBA', 0, 1
+                ).save(path, compress_level=1)
+                paths.append(path)
+    finally:
+        renderer.close()
+
+    return paths
+
+
+def export_animation(
+    path:str, 
+    x_arr:List[float], 
+    y_frames:Union[np.ndarray, str], 
+    fig_label:str='', 
+    frame_titles:List[str]=None, 
+    fps:float=30, 
+    workers:int=1, 
+    encoder:str='ffmpeg', 
+    encoder_args:List[str]=None, 
+    **plot_kwargs, 
+)->List[str]:
+    """
+        Exports an animation of one or more series over many 
+        frames (e.g. a field over config.t_arr), without rebuilding 
+        the figure per frame: the figure is set up once with 
+        build_plot() (headless), after which each frame only 
+        swaps the line data and blits the lines onto the cached 
+        background. Frames are streamed as raw RGBA into an 
+        ffmpeg-compatible encoder; if the encoder cannot be 
+        found, numbered PNG images (e.g. anim_000123.png for 
+        path == 'anim.mp4') are written instead. 
+
+        --Parameters--
+        * path : str // 
+            Path of the video (its extension selects the format, 
+            e.g. '.mp4' or '.gif'). 
+        * x_arr : List[float] // 
+            Horizontal-axis values shared by all series. 
+        * y_frames : Union[np.ndarray, str] // 
+            Real values of each frame, of shape (n_frames, n_x) 
+            or (n_frames, n_series, n_x), e.g. np.abs(psi)**2; 
+            can also be the path of a .npy file (which is read as 
+            a memory map, also by the workers). 
+        * fig_label : str, optional // 
+            Title of the figure,  
+                * by default ''. 
+        * frame_titles : List[str], optional // 
+            Plot title of each frame (e.g. [f't = {t:.2f}' for t in 
+            config.t_arr]), overriding plot_title,  
+                * by default None (i.e. a fixed plot_title). 
+        * fps : float, optional // 
+            Frames per second of the video,  
+                * by default 30. 
+        * workers : int, optional // 
+            Number of processes among which the frame range is 
+            split; with an encoder, each renders a separate segment, 
+            and the segments are then joined without re-encoding,  
+                * by default 1. 
+        * encoder : str, optional // 
+            Name of the encoder executable (with ffmpeg's command-line 
+            interface); None always writes an image sequence,  
+                * by default 'ffmpeg'. 
+        * encoder_args : List[str], optional // 
+            Output options for the encoder, e.g. 
+            ['-c:v', 'libx264', '-crf', '20'],  
+                * by default None (i.e. yuv420p for .mp4/.mov/.mkv). 
+        * **plot_kwargs // 
+            Styling options passed on to build_plot() (headless is 
+            implied, so any given value is ignored); y_lim 
+            defaults to the range of all frames (plus a 5% margin), 
+            so that the axes stay fixed. 
+
+        --Returns--
+        * paths : List[str] // 
+            Paths of the written files (the video, or the images). 
+    """    
+
+    import shutil
+    import warnings
+
+    frames = np.load(y_frames, mmap_mode='r') \
+        if isinstance(y_frames, (str, os.PathLike)) else np.asarray(y_frames)
+    n_frames = len(frames)
+    if n_frames == 0:
+        raise ValueError('export_animation() requires at least one frame')
+    if frame_titles is not None and len(frame_titles) != n_frames:
+        raise ValueError('frame_titles must contain one title per frame')
+    if plot_kwargs.get('y_lim') is None:
+        stats = reduce_arrays([frames], stats=('min', 'max'))
+        margin = 0.05 * (stats.max - stats.min) or 0.5
+        plot_kwargs['y_lim'] = [stats.min - margin, stats.max + margin]
+    plot_kwargs['fig_label'] = fig_label
+    plot_kwargs.pop('headless', None) # always headless
+
+    if encoder and shutil.which(encoder) is None:
+        warnings.warn(f'{encoder} not found; writing an image sequence')
+        encoder = None
+
+    root, ext = os.path.splitext(path)
+    bounds = np.linspace(0, n_frames, min(workers, n_frames) + 1).astype(int)
+    items = []
+    for k, (start, stop) in enumerate(zip(bounds[:-1], bounds[1:])):
+        items.append({
+            'frame_range': (int(start), int(stop)), 
+            'frames': y_frames if isinstance(y_frames, (str, os.PathLike)) 
+                else frames[start:stop], 
+            'titles': None if frame_titles is None 
+                else frame_titles[start:stop], 
+            'x_arr': np.asarray(x_arr), 
+            'path': path if len(bounds) == 2 or not encoder 
+                else f'{root}.part{k:03d}{ext}', 
+            'fps': fps, 
+            'encoder': encoder, 
+            'encoder_args': encoder_args, 
+            'plot_kwargs': plot_kwargs, 
+        })
+
+    if len(items) == 1:
+        chunk_paths = [_render_animation_chunk(items[0])]
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(
+            max_workers=len(items), initializer=_init_plot_worker
+        ) as executor:
+            chunk_paths = list(executor.map(_render_animation_chunk, items))
+    paths = [path for chunk in chunk_paths for path in chunk]
+
+    if encoder and len(items) > 1: # join the segments, without re-encoding
+        import subprocess
+        list_path = f'{root}.parts.txt'
+        with open(list_path, 'w') as file:
+            for part in paths:
+                file.write(f"file '{os.path.abspath(part)}'\n")
+        try:
+            subprocess.run([
+                encoder, '-y', '-loglevel', 'error', '-f', 'concat', 
+                '-safe', '0', '-i', list_path, '-c', 'copy', path
+            ], check=True)
+        finally:
+            os.remove(list_path)
+        for part in paths: # kept if joining failed
+            os.remove(part)
+        paths = [path]
+
+    return paths
+
+
+class SharedArrayRef(NamedTuple):
+    """
+        Lightweight (picklable) descriptor of an array placed in 
+        shared memory by share_array(); pass it between processes 
+        instead of the array, and open it with open_shared(). 
+        Pickling a descriptor hands ownership of its block over 
+        to the process which unpickles it. 
+
+        --Fields--
+        * name : str // 
+            Name of the shared-memory block. 
+        * shape : Tuple[int, ...] // 
+            Shape of the array. 
+        * dtype : str // 
+            Data type of the array (as np.dtype().str). 
+    """    
+
+    name : str
+    shape : Tuple[int, ...]
+    dtype : str
+
+    def __reduce__(self):
+        owned_blocks.discard(self.name) # now owned by the receiver
+        return _receive_shared, (self.name, tuple(self.shape), self.dtype)
+
+
+def _receive_shared(name:str, shape:Tuple[int, ...], dtype:str):
+    """ 
+        Unpickles a SharedArrayRef, taking ownership of its block. 
+    """
+
+    _own_block(name)
+    
+    return SharedArrayRef(name, shape, dtype)
+
+
+def _own_block(name:str):
+    """ 
+        Records a shared-memory block as owned by this process, 
+        so that it is unlinked at exit unless opened before. 
+    """
+
+    if not owned_blocks:
+        atexit.unregister(_unlink_owned_blocks) # registered at most once
+        atexit.register(_unlink_owned_blocks)
+    owned_blocks.add(name)
+
+
+def _unlink_owned_blocks():
+    """ 
+        Unlinks the shared-memory blocks which this process still 
+        owns (e.g. results which were never opened). 
+    """
+
+    from multiprocessing import shared_memory
+
+    while owned_blocks:
+        try:
+            shared_memory.SharedMemory(name=owned_blocks.pop()).unlink()
+        except FileNotFoundError:
+            pass
+
+
+class _SharedBlock:
+    """
+        Owner of an attached shared-memory block, exposed to numpy 
+        through __array_interface__; views made by open_shared() 
+        keep it alive, and the block is closed once the last view 
+        is garbage-collected. 
+    """    
+
+    def __init__(self, shm, shape:Tuple[int, ...], dtype:str):
+        self.shm = shm
+        self.arr = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+        self.__array_interface__ = self.arr.__array_interface__
+
+    def __del__(self):
+        del self.arr # releases the buffer, so that close() succeeds
+        self.shm.close()
+
+
+def share_array(arr:np.ndarray)->SharedArrayRef:
+    """
+        Copies an array into a new shared-memory block (e.g. inside 
+        a worker process), so that only a small descriptor has to be 
+        returned to the parent, rather than the pickled array. 
+        The block is removed by open_shared() in the receiving 
+        process, so every descriptor should be opened exactly once; 
+        a block which is never opened is removed when its owner 
+        (the process which last unpickled the descriptor, or else 
+        the one which shared it) exits. 
+
+        --Parameters--
+        * arr : np.ndarray // 
+            Array (of any shape and non-object dtype) to be shared. 
+
+        --Returns--
+        * ref : SharedArrayRef // 
+            Descriptor of the shared copy. 
+    """    
+
+    from multiprocessing import resource_tracker, shared_memory
+
+    arr = np.asarray(arr)
+    size = max(arr.nbytes, 1)
+    # The block is owned through owned_blocks rather than the resource 
+    # tracker (a forked worker may have its own tracker, which would 
+    # unlink the block when the worker exits):
+    try:
+        shm = shared_memory.SharedMemory(create=True, size=size, track=False)
+    except TypeError: # python < 3.13 has no public opt-out
+        shm = shared_memory.SharedMemory(create=True, size=size)
+        resource_tracker.unregister(shm._name, 'shared_memory')
+    shared = np.ndarray(arr.shape, dtype=arr.dtype, buffer=shm.buf)
+    shared[...] = arr
+    del shared
+    shm.close()
+    _own_block(shm.name)
+
+    return SharedArrayRef(shm.name, arr.shape, arr.dtype.str)
+
+
+def open_shared(ref:SharedArrayRef)->np.ndarray:
+    """
+        Returns a zero-copy view of an array shared with 
+        share_array(), which can be passed straight to e.g. 
+        build_plot() or abs_max(); the block's name is removed 
+        at once (so it cannot leak), and its memory is released 
+        when the last view is garbage-collected. 
+
+        --Parameters--
+        * ref : SharedArrayRef // 
+            Descriptor returned by share_array(). 
+
+        --Returns--
+        * arr : np.ndarray // 
+            View of the shared array. 
+    """    
+
+    from multiprocessing import shared_memory
+
+    shm = shared_memory.SharedMemory(name=ref.name)
+    block = _SharedBlock(shm, tuple(ref.shape), ref.dtype)
+    shm.unlink() # the mapping stays valid until closed
+    owned_blocks.discard(ref.name)
+    
+    return np.asarray(block)
+
+
+def _iter_chunks(arr:np.ndarray, chunk_size:int, offset:int=0):
+    """
+        Yields views of an array, each containing at most 
+        (roughly) chunk_size elements; no element-wise copies 
+        are made, so this is safe for memory-mapped arrays. 
+
+        --Parameters--
+        * arr : np.ndarray // 
+            Array (of any dimension and memory layout) to be split. 
+        * chunk_size : int // 
+            Target number of elements per yielded view. 
+        * offset : int, optional // 
+            Flat index of arr[0] within its parent array 
+            (used when recursing),  
+                * by default 0. 
+
+        --Yields--
+        * offset, chunk : int, np.ndarray // 
+            Flat index of the first element of the chunk (in memory 
+            order for contiguous arrays, otherwise C order), 
+            and the chunk itself. 
+    """    
+
+    if arr.ndim == 0:
+        yield offset, arr.reshape(1)
+        return
+    if arr.flags.c_contiguous or arr.flags.f_contiguous:
+        arr = arr.ravel(order='K') # view (no copy) for contiguous arrays
+    if arr.ndim == 1:
+        for start in range(0, arr.size, chunk_size):
+            yield offset + start, arr[start:start + chunk_size]
+        return
+
+    row_size = arr[0].size
+    if row_size == 0:
+        return
+    if row_size > chunk_size:
+        for i, row in enumerate(arr):
+            yield from _iter_chunks(row, chunk_size, offset + i*row_size)
+    else:
+        rows = chunk_size // row_size
+        for start in range(0, arr.shape[0], rows):
+            yield offset + start*row_size, arr[start:start + rows]
+
+
+def _iter_arrays(arrs:Iterable):
+    """
+        Yields the arrays described by arrs, opening any paths to 
+        .npy files as read-only memory maps. 
+
+        --Parameters--
+        * arrs : Iterable // 
+            Arrays, np.memmap objects, paths to .npy files, 
+            or any iterable (e.g. a generator) of these. 
+    """    
+
+    if isinstance(arrs, (str, os.PathLike, np.ndarray)):
+        arrs = [arrs]
+    for arr in arrs:
+        if isinstance(arr, (str, os.PathLike)):
+            arr = np.load(arr, mmap_mode='r')
+        yield np.asarray(arr)
+
+
+def _chunk_abs_max(chunk:np.ndarray):
+    """
+        Absolute maximum of a single chunk; real chunks are 
+        reduced via max/min, so no temporary array is created. 
+
+        --Parameters--
+        * chunk : np.ndarray // 
+            Non-empty array. 
+
+        --Returns--
+        * out : scalar // 
+            Maximum of the absolute values of the chunk's elements. 
+    """    
+
+    if np.iscomplexobj(chunk):
+        return np.abs(chunk).max()
+    if chunk.dtype.kind in 'bu':
+        return chunk.max()
+    if chunk.dtype.kind == 'i': # python ints avoid overflow of -INT_MIN
+        return max(int(chunk.max()), -int(chunk.min()))
+    return np.maximum(chunk.max(), -chunk.min())
+
+
+def _bounded_map(func, items:Iterable, workers:int)->List:
+    """
+        Maps func over items using a thread pool, while keeping 
+        at most 2*workers items in flight (so that generators 
+        are never consumed far ahead of the workers).
+
+        --Parameters--
+        * func : callable // 
+            Function of a single argument. 
+        * items : Iterable // 
+            Arguments for func. 
+        * workers : int // 
+            Number of threads; workers <= 1 maps serially. 
+
+        --Returns--
+        * results : List // 
+            Results of func, in the order that items were given. 
+    """    
+
+    if workers <= 1:
+        return [func(item) for item in items]
+
+    results = []
+    pending = deque()
+    from concurrent.futures import ThreadPoolExecutor
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for item in items:
+            pending.append(executor.submit(func, item))
+            if len(pending) >= 2 * workers:
+                results.append(pending.popleft().result())
+        results.extend(future.result() for future in pending)
+    
+    return results
+
+
+def abs_max(
+    arrs:Iterable, 
+    chunk_size:int=2**20, 
+    workers:int=1, 
+)->float:
     """
         Finds the maximum from among the absolute values 
         of all elements within several arrays 
-        (where each array can be of any dimension).
+        (where each array can be of any dimension);
+        arrays are reduced in chunks, so no full-size 
+        temporary copies are allocated. 
 
         --Parameters--
-        * arrs : List // 
-            Contains (along axis 0) all arrays to be considered. 
+        * arrs : Iterable // 
+            Contains (along axis 0) all arrays to be considered; 
+            elements may also be np.memmap objects or paths 
+            to .npy files (opened as read-only memory maps), 
+            and arrs may be a generator. 
+        * chunk_size : int, optional // 
+            Number of elements reduced at once,  
+                * by default 2**20. 
+        * workers : int, optional // 
+            Number of threads among which the chunks are 
+            shared (numpy releases the GIL while reducing),  
+                * by default 1. 
 
         --Returns--
         * magnitude_max: float // 
@@ -228,8 +1836,391 @@ def abs_max(arrs:List)->float:
             of the inputted arrays). 
     """    
 
-    maxes = [np.abs(arr).max() for arr in arrs]
+    chunks = (
+        chunk 
+        for arr in _iter_arrays(arrs) 
+        for _, chunk in _iter_chunks(arr, chunk_size) 
+        if chunk.size
+    )
+    maxes = _bounded_map(_chunk_abs_max, chunks, workers)
     magnitude_max = np.amax(maxes)
     
     return magnitude_max
 
+
+class ArrayStats(NamedTuple):
+    """
+        Result record of reduce_arrays(); statistics which 
+        were not requested are None. For complex arrays, 
+        min, max and argmax refer to magnitudes. 
+
+        --Fields--
+        * min : float // 
+            Minimum over all elements. 
+        * max : float // 
+            Maximum over all elements. 
+        * abs_max : float // 
+            Maximum of the absolute values over all elements. 
+        * argmax : Tuple[int, Tuple[int, ...]] // 
+            (index of the array within arrs, index of the maximum 
+            within that array) for the first occurrence of max. 
+        * norm : float // 
+            L2 norm over all elements of all arrays. 
+    """    
+
+    min : float = None
+    max : float = None
+    abs_max : float = None
+    argmax : Tuple[int, Tuple[int, ...]] = None
+    norm : float = None
+
+
+def _chunk_stats(item:Tuple, stats:Tuple[str, ...])->dict:
+    """
+        Partial statistics of a single chunk, for reduce_arrays(). 
+
+        --Parameters--
+        * item : Tuple // 
+            (array index, flat offset, chunk) as yielded 
+            inside reduce_arrays(). 
+        * stats : Tuple[str, ...] // 
+            Names of the requested statistics. 
+
+        --Returns--
+        * out : dict // 
+            Partial statistics, keyed by name. 
+    """    
+
+    index, offset, chunk = item
+    is_complex = np.iscomplexobj(chunk)
+    vals = np.abs(chunk) if is_complex else chunk
+    out = {}
+
+    if 'min' in stats:
+        out['min'] = vals.min()
+    if 'max' in stats or 'argmax' in stats:
+        k = int(vals.argmax())
+        out['max'] = vals.flat[k]
+        out['argmax'] = (index, offset + k)
+    if 'abs_max' in stats:
+        out['abs_max'] = vals.max() if is_complex else _chunk_abs_max(chunk)
+    if 'norm' in stats:
+        if chunk.dtype not in (np.float64, np.complex128):
+            chunk = chunk.astype(np.complex128 if is_complex else np.float64)
+        out['norm'] = np.vdot(chunk, chunk).real
+    
+    return out
+
+
+def reduce_arrays(
+    arrs:Iterable, 
+    stats:Tuple[str, ...]=('min', 'max', 'abs_max', 'argmax', 'norm'), 
+    chunk_size:int=2**16, 
+    workers:int=1, 
+)->ArrayStats:
+    """
+        Computes several statistics over all elements within 
+        several arrays (where each array can be of any dimension 
+        and dtype) in a single pass; each chunk is small enough 
+        to stay in cache while all requested statistics are taken, 
+        so every element is read from memory only once. 
+
+        --Parameters--
+        * arrs : Iterable // 
+            Contains (along axis 0) all arrays to be considered; 
+            accepts the same inputs as abs_max(). 
+        * stats : Tuple[str, ...], optional // 
+            Names of the statistics to be computed, from among 
+            'min', 'max', 'abs_max', 'argmax' and 'norm',  
+                * by default all of them. 
+        * chunk_size : int, optional // 
+            Number of elements reduced at once,  
+                * by default 2**16. 
+        * workers : int, optional // 
+            Number of threads among which the chunks are shared,  
+                * by default 1. 
+
+        --Returns--
+        * out : ArrayStats // 
+            Record of the requested statistics. 
+    """    
+
+    unknown = set(stats) - set(ArrayStats._fields)
+    if unknown:
+        raise ValueError(f'unknown statistics: {sorted(unknown)}')
+
+    layouts = [] # (shape, order) of each array, for unraveling argmax
+    def indexed_chunks():
+        for index, arr in enumerate(_iter_arrays(arrs)):
+            fortran = arr.flags.f_contiguous and not arr.flags.c_contiguous
+            layouts.append((arr.shape, 'F' if fortran else 'C'))
+            for offset, chunk in _iter_chunks(arr, chunk_size):
+                if chunk.size:
+                    yield index, offset, chunk
+
+    parts = _bounded_map(
+        lambda item: _chunk_stats(item, stats), indexed_chunks(), workers
+    )
+    if not parts:
+        raise ValueError('reduce_arrays() requires at least one element')
+
+    results = {}
+    if 'min' in stats:
+        results['min'] = np.amin([part['min'] for part in parts])
+    if 'max' in stats or 'argmax' in stats:
+        best = parts[0]
+        for part in parts[1:]:
+            if part['max'] > best['max']: # keeps the first occurrence
+                best = part
+        if 'max' in stats:
+            results['max'] = best['max']
+        if 'argmax' in stats:
+            index, flat_index = best['argmax']
+            shape, order = layouts[index]
+            results['argmax'] = (
+                index, 
+                tuple(int(i) for i in np.unravel_index(
+                    flat_index, shape, order=order
+                ))
+            )
+    if 'abs_max' in stats:
+        results['abs_max'] = np.amax([part['abs_max'] for part in parts])
+    if 'norm' in stats:
+        results['norm'] = np.sqrt(sum(part['norm'] for part in parts))
+
+    return ArrayStats(**results)
+
+
+class RunningStats:
+    """
+        Online (single-pass) statistics of a sequence of equally 
+        shaped arrays, e.g. a field observed at every step of a 
+        time loop; update() folds each array into running 
+        element-wise statistics (mean and variance via Welford's 
+        algorithm, min, max and abs_max) and an optional fixed-bin 
+        histogram of all values, using only preallocated buffers, 
+        so memory is O(grid) rather than O(grid x steps). 
+        Accumulators filled in parallel (e.g. by worker processes, 
+        since they pickle) are combined with merge(). 
+        For complex arrays, min, max and the histogram refer 
+        to magnitudes, and var to E|x - mean|^2. 
+
+        --Parameters--
+        * shape : Tuple[int, ...] // 
+            Shape of the observed arrays. 
+        * dtype : np.dtype, optional // 
+            Data type of the observed arrays (complex dtypes 
+            give a complex mean),  
+                * by default np.float64. 
+        * stats : Tuple[str, ...], optional // 
+            Names of the statistics to be accumulated, from among 
+            'mean', 'var' (which implies 'mean'), 'min', 'max' 
+            and 'abs_max',  
+                * by default all of them. 
+        * bins : int, optional // 
+            Number of histogram bins,  
+                * by default None (no histogram). 
+        * hist_range : Tuple[float, float], optional // 
+            Lower and upper edges of the histogram; values 
+            outside of it are counted in the outermost bins,  
+                * only required if bins is given. 
+
+        --Fields--
+        * count : int // 
+            Number of arrays accumulated so far. 
+        * mean, min, max, abs_max : np.ndarray // 
+            Element-wise statistics (None if not requested). 
+        * hist : np.ndarray // 
+            Counts of each histogram bin (None without bins). 
+    """    
+
+    all_stats = ('mean', 'var', 'min', 'max', 'abs_max')
+
+    def __init__(
+        self, 
+        shape:Tuple[int, ...], 
+        dtype=None, 
+        stats:Tuple[str, ...]=all_stats, 
+        bins:int=None, 
+        hist_range:Tuple[float, float]=None, 
+    ):
+        unknown = set(stats) - set(self.all_stats)
+        if unknown:
+            raise ValueError(f'unknown statistics: {sorted(unknown)}')
+        if bins and hist_range is None:
+            raise ValueError('a histogram requires hist_range')
+        dtype = np.dtype(np.float64 if dtype is None else dtype)
+        if dtype.kind not in 'fc':
+            raise ValueError('RunningStats requires a float or complex dtype')
+
+        self.shape = tuple(int(n) for n in np.atleast_1d(shape))
+        self.dtype = dtype
+        self.stats = tuple(stats)
+        self.count = 0
+        real = np.empty(0, dtype=dtype).real.dtype
+        def buffer(names, dtype=real):
+            return np.zeros(self.shape, dtype=dtype) \
+                if set(names) & set(stats) else None
+        
+        self.mean = buffer(['mean', 'var'], dtype)
+        self._m2 = buffer(['var']) # sum of squared deviations
+        self.min = buffer(['min'])
+        self.max = buffer(['max'])
+        self.abs_max = buffer(['abs_max'])
+        # Scratch space (reused by every update):
+        self._delta = np.empty(self.shape, dtype=self.dtype)
+        self._tmp = np.empty(self.shape, dtype=self.dtype)
+        self._vals = np.empty(self.shape, dtype=real)
+
+        self.hist = self.hist_edges = None
+        if bins:
+            self.hist = np.zeros(bins, dtype=np.int64)
+            self.hist_edges = np.linspace(*hist_range, bins + 1)
+            self._bin_scale = bins / (hist_range[1] - hist_range[0])
+            self._bin_index = np.empty(self.shape, dtype=np.intp)
+
+    def update(self, arr:np.ndarray):
+        """
+            Folds one array into the running statistics, in place. 
+
+            --Parameters--
+            * arr : np.ndarray // 
+                Array of the accumulator's shape (or broadcastable 
+                to it). 
+        """    
+
+        self.count += 1
+        if self.mean is not None:
+            delta = np.subtract(arr, self.mean, out=self._delta)
+            np.add(
+                self.mean, np.divide(delta, self.count, out=self._tmp), 
+                out=self.mean
+            )
+            if self._m2 is not None: # m2 += conj(x - mean_old) (x - mean)
+                tmp = np.subtract(arr, self.mean, out=self._tmp)
+                np.multiply(np.conjugate(delta, out=delta), tmp, out=tmp)
+                np.add(self._m2, tmp.real, out=self._m2)
+
+        if self.hist is None and not (
+            self.min is not None or self.max is not None 
+            or self.abs_max is not None
+        ):
+            return
+        
+        # Values (magnitudes for complex arrays) and magnitudes:
+        is_complex = self.dtype.kind == 'c'
+        vals = np.abs(arr, out=self._vals) if is_complex \
+            else np.broadcast_to(arr, self.shape)
+        first = self.count == 1
+        if self.min is not None:
+            if first:
+                self.min[...] = vals
+            else:
+                np.minimum(self.min, vals, out=self.min)
+        if self.max is not None:
+            if first:
+                self.max[...] = vals
+            else:
+                np.maximum(self.max, vals, out=self.max)
+        if self.abs_max is not None:
+            if not is_complex:
+                vals = np.abs(arr, out=self._vals)
+            if first:
+                self.abs_max[...] = vals
+            else:
+                np.maximum(self.abs_max, vals, out=self.abs_max)
+
+        if self.hist is not None:
+            if is_complex:
+                vals = self._vals # still holds the magnitudes
+            else:
+                vals = self._vals
+                np.copyto(vals, arr)
+            np.subtract(vals, self.hist_edges[0], out=vals)
+            np.multiply(vals, self._bin_scale, out=vals)
+            np.clip(vals, 0, len(self.hist) - 1, out=vals)
+            np.copyto(self._bin_index, vals, casting='unsafe')
+            np.add.at(self.hist, self._bin_index.ravel(), 1)
+
+    def merge(self, other:RunningStats)->RunningStats:
+        """
+            Combines the statistics of another accumulator 
+            (of the same shape, stats and bins) into this one, 
+            in place, as if its arrays had been passed to update(). 
+
+            --Parameters--
+            * other : RunningStats // 
+                Accumulator to be merged in (left unchanged). 
+
+            --Returns--
+            * self : RunningStats // 
+                This accumulator. 
+        """    
+
+        if other.shape != self.shape or other.stats != self.stats or (
+            (self.hist is None) != (other.hist is None)
+            or self.hist is not None 
+            and not np.array_equal(self.hist_edges, other.hist_edges)
+        ):
+            raise ValueError('accumulators are not compatible')
+        if other.count == 0:
+            return self
+        if self.count == 0:
+            for name in ['mean', '_m2', 'min', 'max', 'abs_max', 'hist']:
+                if getattr(self, name) is not None:
+                    getattr(self, name)[...] = getattr(other, name)
+            self.count = other.count
+            return self
+
+        count = self.count + other.count
+        if self.mean is not None: # Chan et al. pairwise combination
+            delta = np.subtract(other.mean, self.mean, out=self._delta)
+            if self._m2 is not None:
+                tmp = np.multiply(np.conjugate(delta), delta, out=self._tmp)
+                np.multiply(
+                    tmp.real, self.count * other.count / count, out=self._vals
+                )
+                np.add(self._m2, other._m2, out=self._m2)
+                np.add(self._m2, self._vals, out=self._m2)
+            np.multiply(delta, other.count / count, out=delta)
+            np.add(self.mean, delta, out=self.mean)
+        if self.min is not None:
+            np.minimum(self.min, other.min, out=self.min)
+        if self.max is not None:
+            np.maximum(self.max, other.max, out=self.max)
+        if self.abs_max is not None:
+            np.maximum(self.abs_max, other.abs_max, out=self.abs_max)
+        if self.hist is not None:
+            np.add(self.hist, other.hist, out=self.hist)
+        self.count = count
+
+        return self
+
+    def var(self, ddof:int=0)->np.ndarray:
+        """
+            Element-wise variance of the accumulated arrays. 
+
+            --Parameters--
+            * ddof : int, optional // 
+                Delta degrees of freedom (1 gives the unbiased 
+                sample variance),  
+                    * by default 0. 
+
+            --Returns--
+            * out : np.ndarray // 
+                The variance (a new array). 
+        """    
+
+        if self._m2 is None:
+            raise ValueError("'var' was not among the accumulated stats")
+        if self.count <= ddof:
+            return np.full(self.shape, np.nan)
+
+        return self._m2 / (self.count - ddof)
+
+    def std(self, ddof:int=0)->np.ndarray:
+        """ 
+            Element-wise standard deviation (see var()). 
+        """
+
+        return np.sqrt(self.var(ddof))
@@ -1,4 +1,11 @@
-import numpy as np
+from __future__ import annotations
+import logistics
+from functools import cached_property, lru_cache
+
+# numpy is only imported once a grid is built; lazy_import is taken 
+# from logistics, which depends on the standard library only (and is 
+# imported by every script anyway), so config gains no new dependency:
+np = logistics.lazy_import('numpy')
 
 #* Physical constants
 hbar = 1 # Plank's constant, natural units
@@ -11,6 +18,152 @@ t_max = 1 # End of time interval on stopwatch
 dx = 0.1 # x increment
 dt = 0.1 # t increment
 
+
+class Grid:
+    """
+        Uniform grid over [start, stop] with spacing step; derived 
+        arrays are computed on first access, cached, and returned 
+        as read-only arrays (so they can be shared safely). 
+        Create grids through grid(), which memoizes them. 
+
+        --Parameters--
+        * start : float // 
+            First grid point. 
+        * stop : float // 
+            Last grid point (included, as for x_arr/t_arr). 
+        * step : float // 
+            Grid spacing. 
+    """    
+
+    def __init__(self, start:float, stop:float, step:float):
+        self.start = start
+        self.stop = stop
+        self.step = step
+        self._meshes = {}
+
+    def __repr__(self):
+        return f'Grid(start={self.start}, stop={self.stop}, step={self.step})'
+
+    @cached_property
+    def arr(self)->np.ndarray:
+        """ 
+            Grid points. 
+        """
+
+        return _read_only(
+            np.arange(self.start, self.stop + self.step/2, self.step)
+        )
+
+    @property
+    def n(self)->int:
+        """ 
+            Number of grid points. 
+        """
+
+        return len(self.arr)
+
+    @cached_property
+    def wavenumbers(self)->np.ndarray:
+        """ 
+            Angular wavenumbers (2 pi fftfreq) conjugate to the grid, 
+            in np.fft order. 
+        """
+
+        return _read_only(2*np.pi * np.fft.fftfreq(self.n, d=self.step))
+
+    @cached_property
+    def weights(self)->np.ndarray:
+        """ 
+            Trapezoidal integration weights, so that 
+            (f * weights).sum() approximates the integral of f. 
+        """
+
+        weights = np.full(self.n, self.step)
+        weights[[0, -1]] = self.step / 2
+        
+        return _read_only(weights)
+
+    def mesh(self, other:'Grid')->tuple:
+        """
+            Meshgrid of this grid (axis 0) with another (axis 1), 
+            e.g. config.t_grid().mesh(config.x_grid()); cached 
+            per other grid. 
+
+            --Parameters--
+            * other : Grid // 
+                Grid spanning axis 1. 
+
+            --Returns--
+            * mesh : Tuple[np.ndarray, np.ndarray] // 
+                Read-only (broadcast) arrays, as from 
+                np.meshgrid(self.arr, other.arr, indexing='ij'). 
+        """    
+
+        key = (other.start, other.stop, other.step)
+        if key not in self._meshes:
+            self._meshes[key] = tuple(
+                np.broadcast_arrays(self.arr[:, None], other.arr[None, :])
+            )
+        
+        return self._meshes[key]
+
+
+def _read_only(arr:np.ndarray)->np.ndarray:
+    """ 
+        Marks an array as read-only (and returns it). 
+    """
+
+    arr.flags.writeable = False
+    
+    return arr
+
+
+@lru_cache(maxsize=None)
+def grid(start:float, stop:float, step:float)->Grid:
+    """
+        Returns the (memoized) Grid with the given parameters. 
+
+        --Parameters--
+        * start : float // 
+            First grid point. 
+        * stop : float // 
+            Last grid point. 
+        * step : float // 
+            Grid spacing. 
+
+        --Returns--
+        * out : Grid // 
+            Shared grid instance. 
+    """    
+
+    return Grid(start, stop, step)
+
+
+def x_grid()->Grid:
+    """ 
+        Grid over [0, x_max] with spacing dx (current values). 
+    """
+
+    return grid(0, x_max, dx)
+
+
+def t_grid()->Grid:
+    """ 
+        Grid over [0, t_max] with spacing dt (current values). 
+    """
+
+    return grid(0, t_max, dt)
+
+
 #* Constants which follow as a consequence
-x_arr = np.arange(0, x_max + dx/2, dx)
-t_arr = np.arange(0, t_max + dt/2, dt)
+def __getattr__(name:str):
+    """ 
+        Builds x_arr and t_arr on first access, from the current 
+        x_max, dx, t_max and dt (so they are never stale). 
+    """
+
+    if name == 'x_arr':
+        return x_grid().arr
+    if name == 't_arr':
+        return t_grid().arr
+    raise AttributeError(f"module '{__name__}' has no attribute '{name}'")
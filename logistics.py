@@ -1,16 +1,226 @@
-import numpy as np
-import matplotlib as mpl
+from __future__ import annotations
 import time
 import sys
+import os
+import math
 import warnings
-from typing import List, Union
-from functools import reduce
+import signal
+import atexit
+import json
+import pickle
+import hashlib
+import functools
+import threading
+import tracemalloc
+import weakref
+import importlib.util
+from typing import Iterable, List, Union
+from contextlib import ContextDecorator
+
+
+def lazy_import(name:str):
+    """
+        Returns a module whose import is deferred until one of its 
+        attributes is first accessed, so that scripts which never 
+        use e.g. numpy do not pay for importing it; only suitable 
+        for top-level packages (importing a submodule such as 
+        matplotlib.pyplot executes its parent package anyway). 
+
+        --Parameters--
+        * name : str // 
+            Name of the module, e.g. 'numpy'. 
+
+        --Returns--
+        * module : module // 
+            The (possibly not yet executed) module. 
+    """    
+
+    if name in sys.modules:
+        return sys.modules[name]
+    
+    spec = importlib.util.find_spec(name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+
+    return module
+
+
+np = lazy_import('numpy')
 
 
 if True:
     # suppress reportUnboundVariable:
     start_time = None 
+    section_root = None
+
+# Counter arrays of ProgressAggregators, by shared-memory name:
+shared_counters = {}
+
+# Per-thread stacks of open timed_sections:
+section_state = threading.local()
+
+# Hit/miss counts of disk_cache'd functions, by qualified name:
+cache_stats = {}
+
+# Active RunLog (see start_run_log()):
+run_log = None
+
+# Active SamplingProfiler and its output path (see start_profiler()):
+profiler = None
+profile_path = None
+
+# Memory tracking options and run-start snapshot (see start_memory_tracking()):
+memory_tracking = None
+
+# Weak references to arrays watched by LeakCheck, by id (see track_array()):
+tracked_arrays = {}
+
+
+class RunLog:
+    """
+        Structured run log; events (run start/end, versions, file 
+        info, progress ticks, timings, ...) are written as JSON lines, 
+        buffered in memory and flushed in batches, so that even large 
+        sweeps produce one compact file per run at negligible I/O 
+        cost. The usual terminal output is rendered on top of the same 
+        events (and can be switched off with terminal=False). 
+        Use start_run_log() to make a RunLog the active one. 
+
+        --Parameters--
+        * path : str // 
+            Path of the JSON-lines file (appended to). 
+        * terminal : bool, optional // 
+            Option to keep printing the usual terminal output,  
+                * by default True. 
+        * batch_size : int, optional // 
+            Number of buffered events which triggers a flush,  
+                * by default 1000. 
+        * flush_interval : float, optional // 
+            Time (in s) after which buffered events are flushed 
+            (checked whenever an event is emitted),  
+                * by default 5. 
+    """    
+
+    def __init__(
+        self, 
+        path:str, 
+        terminal:bool=True, 
+        batch_size:int=1000, 
+        flush_interval:float=5, 
+    ):
+        self.path = path
+        self.terminal = terminal
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.file = open(path, 'a', buffering=2**20)
+        self.buffer = []
+        self.lock = threading.Lock()
+        self.last_flush = time.perf_counter()
+
+    def emit(self, event:str, **fields):
+        """
+            Buffers one event (flushing if the batch is full or due). 
+
+            --Parameters--
+            * event : str // 
+                Type of the event, e.g. 'progress'. 
+            * **fields // 
+                JSON-serializable details of the event (numpy 
+                scalars and other objects are written via str()). 
+        """    
+
+        record = {'time': time.time(), 'event': event, **fields}
+        line = json.dumps(record, default=str, separators=(',', ':'))
+        with self.lock:
+            self.buffer.append(line)
+            due = (
+                len(self.buffer) >= self.batch_size
+                or time.perf_counter() - self.last_flush >= self.flush_interval
+            )
+        if due:
+            self.flush()
+
+    def flush(self):
+        """ 
+            Writes all buffered events to the file. 
+        """
+
+        with self.lock:
+            lines, self.buffer = self.buffer, []
+            self.last_flush = time.perf_counter()
+            if lines and not self.file.closed:
+                self.file.write('\n'.join(lines) + '\n')
+                self.file.flush()
+
+    def close(self):
+        """ 
+            Flushes the remaining events and closes the file. 
+        """
+
+        self.flush()
+        self.file.close()
+
+
+def start_run_log(path:str, **log_kwargs)->RunLog:
+    """
+        Makes a new RunLog the active one (closing any previous); 
+        it is closed by housekeeping_final(), or at exit. 
+
+        --Parameters--
+        * path : str // 
+            Path of the JSON-lines file. 
+        * **log_kwargs // 
+            Further options for RunLog. 
+
+        --Returns--
+        * log : RunLog // 
+            The active run log. 
+    """    
+
+    global run_log
+    stop_run_log()
+    run_log = RunLog(path, **log_kwargs)
+    atexit.register(stop_run_log)
+    
+    return run_log
+
+
+def stop_run_log():
+    """ 
+        Closes the active RunLog (if any). 
+    """
+
+    global run_log
+    if run_log is not None:
+        run_log.close()
+        run_log = None
+
+
+def emit(event:str, **fields)->bool:
+    """
+        Records an event with the active RunLog (if any). 
+
+        --Parameters--
+        * event : str // 
+            Type of the event. 
+        * **fields // 
+            Details of the event. 
+
+        --Returns--
+        * terminal : bool // 
+            Whether the event should also be printed 
+            (i.e. no run log is active, or it keeps terminal output). 
+    """    
+
+    if run_log is None:
+        return True
+    run_log.emit(event, **fields)
     
+    return run_log.terminal
+
 
 def print_version_info(dependencies:List[str], py_full:bool=False):
     """
@@ -34,11 +244,19 @@ def print_version_info(dependencies:List[str], py_full:bool=False):
     py_vers_len = len(py_vers_template)
     py_vers = sys.version if py_full else sys.version[:py_vers_len]
 
+    # Versions are read from package metadata (without importing):
+    from importlib.metadata import version
+
+    versions = {
+        name: version(name) for name in ['numpy', 'matplotlib'] 
+        if name in dependencies
+    }
+    if not emit('versions', python=py_vers, **versions):
+        return
+
     print(head + ' python--' + py_vers)
-    if 'numpy' in dependencies:
-        print(prefix + 'numpy--' + np.__version__)
-    if 'matplotlib' in dependencies:
-        print(prefix + 'matplotlib--' + mpl.__version__)
+    for name, vers in versions.items():
+        print(prefix + name + '--' + vers)
 
 
 def print_file_info(filename:str=None, location:str=None, ):
@@ -55,6 +273,9 @@ def print_file_info(filename:str=None, location:str=None, ):
                 * by default None.
     """    
 
+    if not emit('file_info', filename=filename, location=location):
+        return
+
     if location:
         print(f'location: "{location}"') 
     if filename:
@@ -81,12 +302,9 @@ def seconds_to_timestring(t:float, full_str:bool=False)->str:
                 mm:ss.ss otherwise.
     """    
 
-    time_parts = reduce(
-        lambda part_tuple, divisor:
-            divmod(part_tuple[0], divisor) + part_tuple[1:], 
-            [(int(t * 100),), 100, 60, 60]
-    )
-    h, m, s, cs = time_parts
+    s, cs = divmod(int(t * 100), 100)
+    m, s = divmod(s, 60)
+    h, m = divmod(m, 60)
     
     if full_str == True or h >= 1:
         out = f'{h:02d}:{m:02d}:{s:02d}.{cs:02d}'
@@ -96,6 +314,60 @@ def seconds_to_timestring(t:float, full_str:bool=False)->str:
     return out
 
 
+def seconds_to_timestrings(ts:List[float], full_str:bool=False):
+    """
+        Vectorized seconds_to_timestring(), for formatting many 
+        times at once (e.g. tables of per-job timings). 
+
+        --Parameters--
+        * ts : List[float] // 
+            Times in fractional seconds (any array-like). 
+        * full_str : bool, optional // 
+            Option used to force output strings to be 
+            of the form hh:mm:ss.ss, 
+                * by default False. 
+
+        --Returns--
+        * out : np.ndarray // 
+            Array of printable strings (same shape as ts), 
+            of the forms given by seconds_to_timestring(). 
+    """    
+
+    # astype truncates toward zero, as int() does:
+    ts = np.asarray(ts, dtype=np.float64)
+    cs_total = (ts * 100).astype(np.int64).ravel()
+    s, cs = np.divmod(cs_total, 100)
+    m, s = np.divmod(s, 60)
+    h, m = np.divmod(m, 60)
+
+    # Unicode code points of 'hh:mm:ss.cs', one row per time 
+    # (viewed directly as fixed-width strings):
+    chars = np.empty((len(cs_total), 11), dtype=np.uint32)
+    for col, part in [(0, h % 100), (3, m), (6, s), (9, cs)]:
+        part = part.astype(np.uint32)
+        tens = part // 10
+        chars[:, col] = tens + ord('0')
+        chars[:, col + 1] = part - 10*tens + ord('0')
+    chars[:, [2, 5]] = ord(':')
+    chars[:, 8] = ord('.')
+    full = chars.view('U11').ravel()
+    
+    if full_str:
+        out = full
+    else:
+        short = np.ascontiguousarray(chars[:, 3:]).view('U8').ravel()
+        out = np.where(h >= 1, full, short)
+
+    # Rare forms (3+ digit hours, negative times) are formatted singly:
+    rare = np.flatnonzero((h >= 100) | (cs_total < 0))
+    if len(rare):
+        out = out.astype(object)
+        for i in rare:
+            out[i] = seconds_to_timestring(ts.flat[i], full_str=full_str)
+
+    return out.reshape(ts.shape)
+
+
 def print_time_required(
     init_time:float, 
     prefix:str='', 
@@ -123,6 +395,8 @@ def print_time_required(
     """    
 
     time_req = time.perf_counter() - init_time
+    if not emit('time_required', label=prefix.strip(), seconds=time_req):
+        return
     time_str = seconds_to_timestring(time_req, full_str=full_str)
     print(prefix + f'time required: {time_str:s}')
     
@@ -143,16 +417,832 @@ def print_total_time(start_time:float, full_str:bool=False):
     """    
     
     elapsed_time = time.perf_counter() - start_time
+    if not emit('total_time', seconds=elapsed_time):
+        return
     time_str = seconds_to_timestring(elapsed_time, full_str=full_str)
     print(f'runtime: {time_str:s}')
 
 
+class SectionStats:
+    """
+        Timing record of one named section within the hierarchy 
+        recorded by timed_section; children are keyed by name. 
+
+        --Parameters--
+        * name : str // 
+            Name of the section. 
+    """    
+
+    def __init__(self, name:str):
+        self.name = name
+        self.count = 0
+        self.wall_total = 0.
+        self.wall_min = math.inf
+        self.wall_max = 0.
+        self.cpu_total = 0.
+        self.mem_count = 0
+        self.mem_peak = 0
+        self.mem_net = 0
+        self.sites = {}
+        self.children = {}
+
+    def child(self, name:str)->'SectionStats':
+        """ 
+            Returns the named child section (creating it if needed). 
+        """
+
+        node = self.children.get(name)
+        if node is None:
+            node = self.children[name] = SectionStats(name)
+        
+        return node
+
+    def record(self, wall:float, cpu:float):
+        """ 
+            Adds one call, of the given wall and cpu times (in s). 
+        """
+
+        self.count += 1
+        self.wall_total += wall
+        self.wall_min = min(self.wall_min, wall)
+        self.wall_max = max(self.wall_max, wall)
+        self.cpu_total += cpu
+
+    def record_memory(self, peak:int, net:int, sites:dict=None):
+        """ 
+            Adds the traced memory of one call: its peak and net 
+            allocations (in bytes, relative to the section's start), 
+            and optionally the net allocations by source line. 
+        """
+
+        self.mem_count += 1
+        self.mem_peak = max(self.mem_peak, peak)
+        self.mem_net += net
+        for site, size in (sites or {}).items():
+            self.sites[site] = self.sites.get(site, 0) + size
+
+    def top_sites(self, n:int=10)->List[tuple]:
+        """ 
+            The n source lines with the largest net allocations 
+            within this section, as (site, bytes). 
+        """
+
+        return sorted(
+            self.sites.items(), key=lambda item: item[1], reverse=True
+        )[:n]
+
+    def to_dict(self)->dict:
+        """ 
+            Converts the hierarchy below (and including) this 
+            section into nested dicts, e.g. for json.dump(). 
+        """
+
+        return {
+            'name': self.name, 
+            'count': self.count, 
+            'wall_total': self.wall_total, 
+            'wall_mean': self.wall_total / self.count if self.count else 0., 
+            'wall_min': self.wall_min if self.count else 0., 
+            'wall_max': self.wall_max, 
+            'cpu_total': self.cpu_total, 
+            **({
+                'mem_peak': self.mem_peak, 
+                'mem_net': self.mem_net, 
+                'sites': dict(self.top_sites()), 
+            } if self.mem_count else {}), 
+            'children': [node.to_dict() for node in self.children.values()], 
+        }
+
+
+class timed_section(ContextDecorator):
+    """
+        Records the wall time (time.perf_counter) and cpu time 
+        (time.process_time) of a named section of code, either as 
+        a context manager ("with timed_section('solve'): ...") or as 
+        a decorator ("@timed_section('solve')"); sections opened 
+        inside other sections are recorded as their children. 
+        The hierarchy is printed by print_section_report(). 
+        While memory is tracked (see start_memory_tracking()), 
+        the peak and net traced allocations of each call are 
+        recorded too (and, if requested, their source lines). 
+
+        --Parameters--
+        * name : str // 
+            Name of the section. 
+    """    
+
+    def __init__(self, name:str):
+        self.name = name
+
+    def __enter__(self):
+        stack = _section_stack()
+        node = stack[-1][0].child(self.name)
+        memory = None
+        if tracemalloc.is_tracing():
+            # [start, peak before entry, peak of closed children, snapshot]:
+            snapshot = _take_snapshot() \
+                if memory_tracking and memory_tracking['sites'] else None
+            current, peak = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            memory = [current, peak, current, snapshot]
+        stack.append((node, time.perf_counter(), time.process_time(), memory))
+        
+        return self
+
+    def __exit__(self, *exc_info):
+        wall_end, cpu_end = time.perf_counter(), time.process_time()
+        stack = getattr(section_state, 'stack', None)
+        if not stack or len(stack) < 2 or stack[0][0] is not section_root:
+            return False # opened under a root discarded since
+        node, wall_start, cpu_start, memory = stack.pop()
+        node.record(wall_end - wall_start, cpu_end - cpu_start)
+        if memory is not None and tracemalloc.is_tracing():
+            start, outer_peak, inner_peak, snapshot = memory
+            sites = None
+            if snapshot is not None:
+                sites = {
+                    _site_label(stat.traceback): stat.size_diff 
+                    for stat in _take_snapshot().compare_to(snapshot, 'lineno')
+                    if stat.size_diff > 0
+                }
+            current, peak = tracemalloc.get_traced_memory()
+            peak = max(peak, inner_peak)
+            node.record_memory(peak - start, current - start, sites)
+            # reset_peak() is global, so the enclosing section's 
+            # peak is carried over explicitly:
+            parent_memory = stack[-1][3]
+            if parent_memory is not None:
+                parent_memory[2] = max(parent_memory[2], outer_peak, peak)
+            elif memory_tracking:
+                memory_tracking['peak'] = max(
+                    memory_tracking['peak'], outer_peak, peak
+                )
+        
+        return False
+
+
+def _section_stack()->List[tuple]:
+    """ 
+        Stack of open sections, as (section, wall start, cpu start, 
+        traced memory state), for the current thread (starting from 
+        the root section). 
+    """
+
+    if section_root is None:
+        reset_sections()
+    stack = getattr(section_state, 'stack', None)
+    if not stack or stack[0][0] is not section_root:
+        stack = section_state.stack = [(section_root, 0., 0., None)]
+    
+    return stack
+
+
+def reset_sections():
+    """ 
+        Discards all recorded sections (called by housekeeping_initial); 
+        sections open in the calling thread (e.g. a timed main() 
+        which calls housekeeping_initial) are carried over into the 
+        new hierarchy, and are recorded there once they close. 
+    """
+
+    global section_root
+    root = SectionStats('total')
+    stack = getattr(section_state, 'stack', None)
+    if stack and stack[0][0] is section_root:
+        node = root
+        for i, (old_node, *frame) in enumerate(stack):
+            if i:
+                node = node.child(old_node.name)
+            stack[i] = (node, *frame)
+    section_root = root
+
+
+def print_section_report(prefix:str=''):
+    """
+        Prints the hierarchy of sections recorded by timed_section, 
+        with call counts, total and mean/min/max wall times, and 
+        total cpu time of each; if memory was tracked, the peak and 
+        mean net traced allocations (in MB) are added. 
+
+        --Parameters--
+        * prefix: str, optional //
+            Gets printed at the start of each line,
+                * by default ''.
+    """    
+
+    if not emit('sections', root=section_root and section_root.to_dict()):
+        return
+
+    def has_memory(node:SectionStats)->bool:
+        return node.mem_count > 0 or any(
+            has_memory(child) for child in node.children.values()
+        )
+    show_memory = bool(section_root) and has_memory(section_root)
+
+    def print_node(node:SectionStats, depth:int):
+        memory = ''
+        if show_memory and node.mem_count:
+            memory = (
+                f' {node.mem_peak / 2**20:>10.2f}'
+                + f' {node.mem_net / node.mem_count / 2**20:>10.2f}'
+            )
+        if node.count:
+            mean = node.wall_total / node.count
+            wall_str = (
+                f'{1e3 * mean:>10.3f} {1e3 * node.wall_min:>10.3f} '
+                + f'{1e3 * node.wall_max:>10.3f} '
+            )
+            name = node.name
+        else: # still open (e.g. a timed main() printing the report)
+            wall_str = f'{"-":>10s} {"-":>10s} {"-":>10s} '
+            name = node.name + ' (open)'
+        print(
+            prefix + f'{"  " * depth + name:<32s} '
+            + f'{node.count:>8d} '
+            + f'{seconds_to_timestring(node.wall_total):>11s} '
+            + wall_str
+            + f'{seconds_to_timestring(node.cpu_total):>11s}'
+            + memory
+        )
+        for child in node.children.values():
+            print_node(child, depth + 1)
+
+    print(
+        prefix + f'{"section":<32s} {"calls":>8s} {"wall":>11s} '
+        + f'{"mean[ms]":>10s} {"min[ms]":>10s} {"max[ms]":>10s} '
+        + f'{"cpu":>11s}'
+        + (f' {"peak[MB]":>10s} {"net[MB]":>10s}' if show_memory else '')
+    )
+    if section_root:
+        for node in section_root.children.values():
+            print_node(node, 0)
+
+
+def dump_sections(path:str):
+    """
+        Writes the hierarchy of sections recorded by timed_section 
+        to a JSON file (times in s). 
+
+        --Parameters--
+        * path : str // 
+            Path of the JSON file. 
+    """    
+
+    root = section_root or SectionStats('total')
+    with open(path, 'w') as file:
+        json.dump(root.to_dict(), file, indent=2)
+
+
+class SamplingProfiler:
+    """
+        Low-overhead statistical profiler (pure python): a timer 
+        signal interrupts the main thread every interval seconds, 
+        and the handler records the current call stack, so the 
+        cost scales with the number of samples rather than with 
+        the number of calls. Requires signal.setitimer (i.e. not 
+        Windows) and must be started from the main thread; 
+        only the main thread is sampled. 
+
+        --Parameters--
+        * interval : float, optional // 
+            Time (in s) between samples,  
+                * by default 0.005. 
+        * clock : str, optional // 
+            'cpu' (samples cpu time of the process, via SIGPROF) 
+            or 'wall' (samples wall-clock time, via SIGALRM, so 
+            that e.g. sleeping and waiting on I/O are included),  
+                * by default 'cpu'. 
+
+        --Fields--
+        * samples : dict // 
+            Number of samples of each call stack, keyed by tuples 
+            of code objects (innermost first). 
+    """    
+
+    timers = {
+        'cpu': ('ITIMER_PROF', 'SIGPROF'), 
+        'wall': ('ITIMER_REAL', 'SIGALRM'), 
+    }
+
+    def __init__(self, interval:float=0.005, clock:str='cpu'):
+        if clock not in self.timers:
+            raise ValueError(f'unknown clock: {clock!r}')
+        self.interval = interval
+        self.clock = clock
+        self.samples = {}
+        self.running = False
+        self.previous_handler = None
+
+    def _sample(self, signum, frame):
+        """ 
+            Signal handler; records the interrupted call stack. 
+        """
+
+        stack = []
+        while frame is not None:
+            stack.append(frame.f_code)
+            frame = frame.f_back
+        stack = tuple(stack)
+        self.samples[stack] = self.samples.get(stack, 0) + 1
+
+    def start(self)->bool:
+        """
+            Installs the signal handler and starts the timer. 
+
+            --Returns--
+            * started : bool // 
+                Whether sampling is supported (and was started). 
+        """    
+
+        if not hasattr(signal, 'setitimer'):
+            warnings.warn('SamplingProfiler requires signal.setitimer')
+            return False
+        timer_name, signal_name = self.timers[self.clock]
+        signum = getattr(signal, signal_name)
+        self.previous_handler = signal.signal(signum, self._sample)
+        signal.setitimer(
+            getattr(signal, timer_name), self.interval, self.interval
+        )
+        self.running = True
+        
+        return True
+
+    def stop(self):
+        """ 
+            Stops the timer and restores the previous signal handler. 
+        """
+
+        if not self.running:
+            return
+        timer_name, signal_name = self.timers[self.clock]
+        signal.setitimer(getattr(signal, timer_name), 0)
+        signal.signal(getattr(signal, signal_name), self.previous_handler)
+        self.running = False
+
+    def __enter__(self)->SamplingProfiler:
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    @staticmethod
+    def label(code)->str:
+        """ 
+            Readable name of a function, e.g. 'main (template.py:62)'. 
+        """
+
+        name = getattr(code, 'co_qualname', code.co_name)
+        filename = os.path.basename(code.co_filename)
+        
+        return f'{name} ({filename}:{code.co_firstlineno})'
+
+    def collapsed(self)->List[str]:
+        """
+            The samples in collapsed-stack format, as read by 
+            flamegraph.pl, speedscope, etc. 
+
+            --Returns--
+            * lines : List[str] // 
+                One line per distinct stack: frames from the 
+                outermost to the innermost, joined by ';', 
+                followed by a space and the number of samples. 
+        """    
+
+        labels = {}
+        lines = []
+        for stack, count in self.samples.items():
+            frames = []
+            for code in reversed(stack):
+                if code not in labels:
+                    labels[code] = self.label(code).replace(';', ':')
+                frames.append(labels[code])
+            lines.append(f'{";".join(frames)} {count}')
+        
+        return sorted(lines)
+
+    def write_collapsed(self, path:str):
+        """
+            Writes the samples to a collapsed-stack file 
+            (see collapsed()). 
+
+            --Parameters--
+            * path : str // 
+                Path of the output file. 
+        """    
+
+        with open(path, 'w') as file:
+            file.writelines(line + '\n' for line in self.collapsed())
+
+    def top(self, n:int=20)->List[tuple]:
+        """
+            Functions with the most samples. 
+
+            --Parameters--
+            * n : int, optional // 
+                Number of functions,  
+                    * by default 20. 
+
+            --Returns--
+            * rows : List[tuple] // 
+                (label, self samples, total samples) of each function, 
+                ordered by self samples; self samples are those in 
+                which the function itself was running, total samples 
+                also include time in the functions it called. 
+        """    
+
+        self_counts, total_counts = {}, {}
+        for stack, count in self.samples.items():
+            self_counts[stack[0]] = self_counts.get(stack[0], 0) + count
+            for code in set(stack):
+                total_counts[code] = total_counts.get(code, 0) + count
+        ranked = sorted(
+            total_counts, 
+            key=lambda code: (self_counts.get(code, 0), total_counts[code]), 
+            reverse=True
+        )
+        
+        return [
+            (self.label(code), self_counts.get(code, 0), total_counts[code]) 
+            for code in ranked[:n]
+        ]
+
+    def print_top(self, n:int=20, prefix:str=''):
+        """
+            Prints the functions with the most samples (see top()), 
+            as percentages of all samples. 
+
+            --Parameters--
+            * n : int, optional // 
+                Number of functions,  
+                    * by default 20. 
+            * prefix: str, optional //
+                Gets printed at the start of each line,
+                    * by default ''.
+        """    
+
+        n_samples = sum(self.samples.values())
+        rows = self.top(n)
+        if not emit(
+            'profile', clock=self.clock, interval=self.interval, 
+            samples=n_samples, top=rows
+        ):
+            return
+
+        print(
+            prefix + f'profile: {n_samples} samples '
+            + f'({self.clock} time, every {1e3 * self.interval:g} ms)'
+        )
+        print(prefix + f'{"self":>7s} {"total":>7s}  function')
+        for label, n_self, n_total in rows:
+            print(
+                prefix + f'{100 * n_self / n_samples:6.1f}% '
+                + f'{100 * n_total / n_samples:6.1f}%  {label}'
+            )
+
+
+def start_profiler(
+    path:str='profile.collapsed', 
+    **profiler_kwargs, 
+)->SamplingProfiler:
+    """
+        Starts a SamplingProfiler as the active one (stopping any 
+        previous); it is finished by housekeeping_final(). 
+
+        --Parameters--
+        * path : str, optional // 
+            Path of the collapsed-stack file written by 
+            stop_profiler(),  
+                * by default 'profile.collapsed'. 
+        * **profiler_kwargs // 
+            Further options for SamplingProfiler. 
+
+        --Returns--
+        * profiler : SamplingProfiler // 
+            The active profiler. 
+    """    
+
+    global profiler, profile_path
+    if profiler is not None:
+        profiler.stop()
+    profiler = SamplingProfiler(**profiler_kwargs)
+    profile_path = path
+    if not profiler.start():
+        profiler = None
+    
+    return profiler
+
+
+def stop_profiler(top:int=20, prefix:str=''):
+    """
+        Stops the active SamplingProfiler (if any), writes its 
+        collapsed-stack file and prints its top functions. 
+
+        --Parameters--
+        * top : int, optional // 
+            Number of functions printed (0 prints none),  
+                * by default 20. 
+        * prefix: str, optional //
+            Gets printed at the start of each line,
+                * by default ''.
+    """    
+
+    global profiler
+    if profiler is None:
+        return
+    profiler.stop()
+    if profiler.samples:
+        profiler.write_collapsed(profile_path)
+        if emit('profile_file', path=profile_path):
+            print(prefix + f'profile: {profile_path}')
+        if top:
+            profiler.print_top(top, prefix=prefix)
+    profiler = None
+
+
+def _profile_option(profile:Union[bool, str])->str:
+    """ 
+        Path of the collapsed-stack file requested through 
+        housekeeping_initial's profile option or (if that is None) 
+        the LOGISTICS_PROFILE environment variable, or None. 
+    """
+
+    if profile is None:
+        profile = os.environ.get('LOGISTICS_PROFILE', '')
+        if profile.lower() in ('', '0', 'false', 'no', 'off'):
+            return None
+        if profile.lower() in ('1', 'true', 'yes', 'on'):
+            profile = True
+    if profile is True:
+        return 'profile.collapsed'
+    
+    return profile or None
+
+
+def peak_rss()->int:
+    """ 
+        Peak resident set size of the process (in bytes), 
+        or None where the resource module is unavailable (Windows). 
+    """
+
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    
+    return peak if sys.platform == 'darwin' else peak * 1024 # kB on Linux
+
+
+def _take_snapshot()->tracemalloc.Snapshot:
+    """ 
+        tracemalloc snapshot without the allocations of tracemalloc, 
+        this module (e.g. section bookkeeping) and the import machinery. 
+    """
+
+    return tracemalloc.take_snapshot().filter_traces((
+        tracemalloc.Filter(False, tracemalloc.__file__), 
+        tracemalloc.Filter(False, __file__), 
+        tracemalloc.Filter(False, '<frozen importlib._bootstrap*>'), 
+        tracemalloc.Filter(False, '<unknown>'), 
+    ))
+
+
+def _site_label(traceback:tracemalloc.Traceback)->str:
+    """ 
+        Readable allocation site, e.g. 'common.py:1234'. 
+    """
+
+    frame = traceback[0]
+    
+    return f'{os.path.basename(frame.filename)}:{frame.lineno}'
+
+
+def start_memory_tracking(frames:int=1, sites:bool=False):
+    """
+        Starts tracing allocations with tracemalloc (if not already 
+        tracing), so that timed_sections record their peak and net 
+        allocations, and print_memory_report() can list the run's 
+        top allocation sites; tracing slows allocation-heavy code 
+        down noticeably, so it is opt-in. 
+
+        --Parameters--
+        * frames : int, optional // 
+            Number of stack frames stored per allocation,  
+                * by default 1. 
+        * sites : bool, optional // 
+            Option to also record the allocation sites of each 
+            timed_section call (two full snapshots per call, which 
+            can take seconds once many objects are alive, so only 
+            suitable for a few coarse sections),  
+                * by default False. 
+    """    
+
+    global memory_tracking
+    started = not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start(frames)
+    memory_tracking = {
+        'started': started, 
+        'sites': sites, 
+        'snapshot': _take_snapshot(), 
+        'peak': 0, # run peak, carried over timed_sections' reset_peak()
+    }
+
+
+def stop_memory_tracking():
+    """ 
+        Stops tracing started by start_memory_tracking() (if any). 
+    """
+
+    global memory_tracking
+    if memory_tracking and memory_tracking['started']:
+        tracemalloc.stop()
+    memory_tracking = None
+
+
+def print_memory_report(top:int=10, prefix:str=''):
+    """
+        Prints the peak resident set size of the process and, 
+        while memory is tracked (see start_memory_tracking()), 
+        the peak traced memory and the source lines with the 
+        largest net allocations since tracking started 
+        (for the whole run, and for each timed_section with 
+        recorded sites). 
+
+        --Parameters--
+        * top : int, optional // 
+            Number of allocation sites listed,  
+                * by default 10. 
+        * prefix: str, optional //
+            Gets printed at the start of each line,
+                * by default ''.
+    """    
+
+    rss = peak_rss()
+    traced = run_sites = None
+    if memory_tracking and tracemalloc.is_tracing():
+        current, peak = tracemalloc.get_traced_memory()
+        traced = (current, max(peak, memory_tracking['peak']))
+        run_sites = [
+            (_site_label(stat.traceback), stat.size_diff)
+            for stat in _take_snapshot().compare_to(
+                memory_tracking['snapshot'], 'lineno'
+            )[:top]
+            if stat.size_diff > 0
+        ]
+    section_sites = {}
+    def collect(node:SectionStats, path:str):
+        for child in node.children.values():
+            child_path = f'{path}/{child.name}' if path else child.name
+            if child.sites:
+                section_sites[child_path] = child.top_sites(top)
+            collect(child, child_path)
+    if section_root:
+        collect(section_root, '')
+
+    if not emit(
+        'memory', peak_rss=rss, 
+        traced_current=traced and traced[0], traced_peak=traced and traced[1], 
+        sites=run_sites, section_sites=section_sites or None
+    ):
+        return
+
+    line = prefix + 'memory: peak RSS ' \
+        + ('n/a' if rss is None else f'{rss / 2**20:.1f} MB')
+    if traced:
+        line += f', traced peak {traced[1] / 2**20:.1f} MB' \
+            + f' (current {traced[0] / 2**20:.1f} MB)'
+    print(line)
+    if run_sites:
+        print(prefix + 'top allocation sites (net, since tracking started):')
+        for site, size in run_sites:
+            print(prefix + f'  {size / 2**20:10.3f} MB  {site}')
+    for path, sites in section_sites.items():
+        print(prefix + f'top allocation sites of section "{path}":')
+        for site, size in sites:
+            print(prefix + f'  {size / 2**20:10.3f} MB  {site}')
+
+
+def track_array(arr:np.ndarray)->np.ndarray:
+    """
+        Registers an array (by weak reference) with the tracked 
+        arrays watched by LeakCheck; the array is forgotten as 
+        soon as it is garbage-collected. 
+
+        --Parameters--
+        * arr : np.ndarray // 
+            Array to be watched. 
+
+        --Returns--
+        * arr : np.ndarray // 
+            The same array (so that calls can be inlined). 
+    """    
+
+    key = id(arr)
+    def forget(ref):
+        if tracked_arrays.get(key) is ref:
+            del tracked_arrays[key]
+    tracked_arrays[key] = weakref.ref(arr, forget)
+    
+    return arr
+
+
+class LeakCheck:
+    """
+        Watches quantities which should stay bounded across the 
+        iterations of a loop--the number of open matplotlib 
+        figures (e.g. from build_plot calls that are never closed), 
+        and the number and total size of live arrays registered 
+        with track_array()--and prints a warning when one of them 
+        has grown at patience consecutive check() calls. 
+
+        --Parameters--
+        * patience : int, optional // 
+            Number of consecutive increases which trigger 
+            a warning (repeated every patience further increases),  
+                * by default 3. 
+        * prefix: str, optional //
+            Gets printed at the start of each warning,
+                * by default ''.
+    """    
+
+    def __init__(self, patience:int=3, prefix:str=''):
+        self.patience = patience
+        self.prefix = prefix
+        self.last = {}
+        self.streaks = {}
+
+    @staticmethod
+    def counts()->dict:
+        """ 
+            Current values of the watched quantities. 
+        """
+
+        counts = {}
+        plt = sys.modules.get('matplotlib.pyplot') # only if already in use
+        if plt is not None:
+            counts['open figures'] = len(plt.get_fignums())
+        arrs = [ref() for ref in list(tracked_arrays.values())]
+        arrs = [arr for arr in arrs if arr is not None]
+        counts['tracked arrays'] = len(arrs)
+        counts['tracked MB'] = sum(arr.nbytes for arr in arrs) / 2**20
+        
+        return counts
+
+    def check(self, label:str='')->List[str]:
+        """
+            Compares the watched quantities against the previous 
+            call, warning about those which keep growing. 
+
+            --Parameters--
+            * label : str, optional // 
+                Description of the current iteration, 
+                added to any warnings,  
+                    * by default ''. 
+
+            --Returns--
+            * grown : List[str] // 
+                Names of the quantities which were warned about. 
+        """    
+
+        counts = self.counts()
+        grown = []
+        for name, value in counts.items():
+            previous = self.last.get(name)
+            increased = previous is not None and value > previous
+            self.streaks[name] = self.streaks.get(name, 0) + 1 \
+                if increased else 0
+            if self.streaks[name] and self.streaks[name] % self.patience == 0:
+                grown.append(name)
+        self.last = counts
+
+        for name in grown:
+            if emit(
+                'leak_warning', quantity=name, value=counts[name], 
+                streak=self.streaks[name], label=label
+            ):
+                print(
+                    self.prefix + f'memory warning: {name} grew at '
+                    + f'{self.streaks[name]} consecutive checks '
+                    + f'(now {counts[name]:g})' 
+                    + (f' [{label}]' if label else '')
+                )
+
+        return grown
+
+
 def housekeeping_initial(
     ignore_warnings:bool=False, 
     location:str=None,
     filename:str=None,
     print_version:Union[bool, List]=False,
     dependencies:List[str]=None,
+    log_path:str=None,
+    log_terminal:bool=True,
+    profile:Union[bool, str]=None,
+    profile_interval:float=0.005,
+    track_memory:Union[bool, List]=False,
 ):
     """
         Initial setup to make terminal output more legible.
@@ -184,32 +1274,82 @@ def housekeeping_initial(
                 * only required if (print_version == True) 
                 OR (print_version[0] == True), 
                 * by default None. 
+        * log_path : str, optional // 
+            Path of a JSON-lines RunLog which records the run's 
+            events (see start_run_log()),  
+                * by default None (no run log). 
+        * log_terminal : bool, optional // 
+            Option to keep printing to the terminal while a 
+            run log is written,  
+                * only required if log_path is given, 
+                * by default True. 
+        * profile : Union[bool, str], optional // 
+            Option to profile the run with a SamplingProfiler 
+            (see start_profiler()); can also be set as the path 
+            of the collapsed-stack file (True gives 
+            'profile.collapsed'); when None, the LOGISTICS_PROFILE 
+            environment variable is used instead (e.g. 
+            LOGISTICS_PROFILE=1 or LOGISTICS_PROFILE=run.collapsed), 
+            so that scripts can be profiled without code changes,  
+                * by default None. 
+        * profile_interval : float, optional // 
+            Time (in s) between profiler samples,  
+                * only required if profiling, 
+                * by default 0.005. 
+        * track_memory : Union[bool, List], optional // 
+            Option to trace allocations with tracemalloc 
+            (see start_memory_tracking()); can also be set as 
+            [bool, bool] where the second bool enables recording 
+            the allocation sites of each timed_section,  
+                * by default False. 
     """    
     
     line = '=' * 40
     
     global start_time
     start_time = time.perf_counter()
+    reset_sections()
     
     if ignore_warnings:
         warnings.filterwarnings('ignore')
+
+    if log_path:
+        start_run_log(log_path, terminal=log_terminal)
+    terminal = emit('run_start', argv=sys.argv, pid=os.getpid())
     
-    print()
+    if terminal:
+        print()
     
     py_full = print_version[1] if type(print_version) == list else False
     if print_version == True or print_version[0] == True:
         print_version_info(dependencies=dependencies, py_full=py_full)
     
     print_file_info(filename=filename, location=location)
-    print('--NEW RUN--')
-    print(line)
-    print()
+    if terminal:
+        print('--NEW RUN--')
+        print(line)
+        print()
+
+    if track_memory == True or (
+        type(track_memory) == list and track_memory[0] == True
+    ):
+        sites = track_memory[1] if type(track_memory) == list else False
+        start_memory_tracking(sites=sites)
+    profile_file = _profile_option(profile)
+    if profile_file:
+        start_profiler(profile_file, interval=profile_interval)
 
 
 def housekeeping_final(
     location:str=None,
     filename:str=None,
     print_timing:bool=False,
+    print_sections:bool=False,
+    sections_path:str=None,
+    print_cache:bool=False,
+    profile_top:int=20,
+    print_memory:bool=False,
+    memory_top:int=10,
 ):
     """
         Final cleanup to make terminal output more legible. 
@@ -225,19 +1365,67 @@ def housekeeping_final(
             Option to print the total time required for the 
             current script, 
                 * by default False. 
+        * print_sections : bool, optional // 
+            Option to print the hierarchy of sections recorded 
+            with timed_section (see print_section_report()), 
+                * by default False. 
+        * sections_path : str, optional // 
+            Path of a JSON file to which the recorded sections 
+            are written, 
+                * by default None. 
+        * print_cache : bool, optional // 
+            Option to print the hit/miss counts of functions 
+            decorated with disk_cache (see print_cache_stats()), 
+                * by default False. 
+        * profile_top : int, optional // 
+            Number of hot functions printed when the run was 
+            profiled (see stop_profiler()), 
+                * by default 20. 
+        * print_memory : bool, optional // 
+            Option to print the peak memory usage, and the top 
+            allocation sites if memory was tracked 
+            (see print_memory_report()), 
+                * by default False. 
+        * memory_top : int, optional // 
+            Number of allocation sites printed, 
+                * only required if print_memory == True, 
+                * by default 10. 
     """    
 
+    if profiler is not None: # the report itself should not be sampled
+        profiler.stop()
     line = '=' * 40
+    terminal = run_log is None or run_log.terminal
     
-    print()
-    print(line)
+    if terminal:
+        print()
+        print(line)
     print_file_info(filename=filename, location=location) 
     if print_timing:
         print_total_time(
             start_time=start_time, full_str=False
         )
-    print('--DONE--')
-    print()
+    if print_sections and section_root:
+        print_section_report()
+    if sections_path:
+        dump_sections(sections_path)
+    if print_cache:
+        print_cache_stats()
+    if print_memory:
+        print_memory_report(top=memory_top)
+    stop_memory_tracking()
+    stop_profiler(top=profile_top)
+    if run_log is not None:
+        emit(
+            'run_end', 
+            seconds=None if start_time is None 
+                else time.perf_counter() - start_time, 
+            peak_rss=peak_rss()
+        )
+    stop_run_log()
+    if terminal:
+        print('--DONE--')
+        print()
     
 
 def print_loop_progress(
@@ -267,9 +1455,567 @@ def print_loop_progress(
     """    
 
     percent_complete = 100 * (index) // index_max
+    if run_log is not None:
+        # Only changes of the percentage are logged:
+        if index == 0 or percent_complete != 100 * (index-1) // index_max:
+            emit(
+                'progress', label=prefix.strip(), 
+                index=index, index_max=index_max, percent=percent_complete
+            )
+        if not run_log.terminal:
+            return
     print(
         '\r' + prefix + f'progress: {percent_complete:0.0f}%',
         flush=True, end=''
     )
     if index == index_max: # condition for last step in loop
         print() 
+
+
+class ProgressReporter:
+    """
+        Low-overhead replacement for print_loop_progress(); 
+        the progress line (percentage, rate and ETA) is only 
+        redrawn when the displayed percentage changes or when 
+        interval seconds have passed, so each update() between 
+        redraws costs a single integer comparison. Output is 
+        suppressed when the stream is not a terminal. 
+
+        --Parameters--
+        * index_max : int // 
+            The loop's (inclusive) final index, as for 
+            print_loop_progress(). 
+        * prefix : str, optional // 
+            Gets printed on the same line just before the 
+            displayed progress,  
+                * by default ''. 
+        * interval : float, optional // 
+            Maximum time (in s) between redraws while the 
+            percentage is unchanged,  
+                * by default 0.5. 
+        * stream : file-like, optional // 
+            Destination of the progress line,  
+                * by default None (i.e. sys.stdout). 
+        * enabled : bool, optional // 
+            Option to force output on or off,  
+                * by default None (i.e. only if stream is a TTY). 
+    """    
+
+    def __init__(
+        self, 
+        index_max:int, 
+        prefix:str='', 
+        interval:float=0.5, 
+        stream=None, 
+        enabled:bool=None, 
+    ):
+        self.index_max = max(index_max, 1)
+        self.prefix = prefix
+        self.interval = interval
+        self.stream = stream or sys.stdout
+        if enabled is None:
+            isatty = getattr(self.stream, 'isatty', None)
+            enabled = bool(isatty and isatty())
+        self.enabled = enabled
+        self.init_time = time.perf_counter()
+        self.last_len = 0
+        self.next_index = 0 if enabled or run_log else math.inf
+
+    def update(self, index:int):
+        """
+            Goes inside the body of a loop, as for 
+            print_loop_progress(). 
+
+            --Parameters--
+            * index : int // 
+                The integer index representing the current step. 
+        """    
+
+        if index >= self.next_index:
+            self._render(index)
+
+    def _render(self, index:int):
+        """ 
+            Redraws the progress line and schedules the next redraw. 
+        """
+
+        now = time.perf_counter()
+        elapsed = now - self.init_time
+        percent_complete = 100 * index // self.index_max
+        rate = index / elapsed if elapsed > 0 else 0
+        if rate > 0:
+            eta = (self.index_max - index) / rate
+            eta_str = seconds_to_timestring(eta)
+        else:
+            eta_str = '--:--.--'
+        
+        if run_log is not None:
+            emit(
+                'progress', label=self.prefix.strip(), index=index, 
+                index_max=self.index_max, percent=percent_complete, 
+                rate=rate
+            )
+        if self.enabled:
+            line = (
+                self.prefix + f'progress: {percent_complete:d}% '
+                + f'({rate:.3g} it/s, eta {eta_str})'
+            )
+            padding = ' ' * max(self.last_len - len(line), 0)
+            self.stream.write('\r' + line + padding)
+            self.stream.flush()
+            self.last_len = len(line)
+        
+        if index >= self.index_max: # last step in loop
+            if self.enabled:
+                self.stream.write('\n')
+            self.next_index = math.inf
+            return
+        
+        # Next redraw: the next percentage, or after about interval s:
+        next_percent = (
+            -(-(percent_complete + 1) * self.index_max // 100)
+        )
+        next_time = index + max(int(rate * self.interval), 1)
+        self.next_index = min(next_percent, next_time, self.index_max)
+
+    def close(self):
+        """ 
+            Finishes the progress line (if the loop ended early). 
+        """
+
+        if self.next_index != math.inf:
+            self._render(self.index_max)
+
+
+def progress(
+    iterable:Iterable, 
+    index_max:int=None, 
+    prefix:str='', 
+    **reporter_kwargs, 
+):
+    """
+        Wraps an iterable so that its progress is reported by 
+        a ProgressReporter, e.g. "for x in progress(arr): ...". 
+
+        --Parameters--
+        * iterable : Iterable // 
+            Items to be looped over. 
+        * index_max : int, optional // 
+            Final index of the loop,  
+                * by default None (i.e. len(iterable) - 1). 
+        * prefix : str, optional // 
+            Gets printed just before the displayed progress,  
+                * by default ''. 
+        * **reporter_kwargs // 
+            Further options for ProgressReporter. 
+
+        --Yields--
+        * item // 
+            Each item of iterable. 
+    """    
+
+    if index_max is None:
+        index_max = len(iterable) - 1
+    reporter = ProgressReporter(index_max, prefix=prefix, **reporter_kwargs)
+    
+    for index, item in enumerate(iterable):
+        if index >= reporter.next_index:
+            reporter._render(index)
+        yield item
+    reporter.close()
+
+
+def _attach_shared_memory(name:str):
+    """
+        Attaches to an existing shared-memory block without 
+        tracking it (only the creating process should unlink it); 
+        before python 3.13, the attaching process's registration 
+        is left in place, since pool workers share the resource 
+        tracker of their parent (which unregisters on unlink). 
+
+        --Parameters--
+        * name : str // 
+            Name of the shared-memory block. 
+
+        --Returns--
+        * shm : shared_memory.SharedMemory // 
+            The attached block. 
+    """    
+
+    from multiprocessing import shared_memory
+
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError: # python < 3.13
+        return shared_memory.SharedMemory(name=name)
+
+
+class WorkerProgress:
+    """
+        Handle through which one worker (thread or process) posts 
+        its progress to a ProgressAggregator; posting is a single 
+        write into shared memory, so it never blocks on I/O. 
+        Instances are picklable, and can be passed to pools. 
+
+        --Parameters--
+        * name : str // 
+            Name of the aggregator's shared-memory block. 
+        * worker : int // 
+            Index of this worker's counter. 
+    """    
+
+    def __init__(self, name:str, worker:int):
+        self.name = name
+        self.worker = worker
+        self.counts = None
+
+    def __getstate__(self):
+        return {'name': self.name, 'worker': self.worker, 'counts': None}
+
+    def _attach(self):
+        """ 
+            Finds the shared counters (attaching in other processes). 
+        """
+
+        if self.name in shared_counters:
+            self.counts = shared_counters[self.name]
+        else:
+            self.shm = _attach_shared_memory(self.name)
+            self.counts = np.ndarray(
+                (len(self.shm.buf) // 8,), dtype=np.int64, buffer=self.shm.buf
+            )
+            shared_counters[self.name] = self.counts
+
+    def update(self, index:int):
+        """
+            Posts the current step of the worker's loop. 
+
+            --Parameters--
+            * index : int // 
+                The integer index representing the current step 
+                (i.e. index + 1 steps are complete). 
+        """    
+
+        if self.counts is None:
+            self._attach()
+        self.counts[self.worker] = index + 1
+
+
+class ProgressAggregator:
+    """
+        Combines the progress of several workers (threads or 
+        processes) into one terminal line, rendered by a single 
+        display thread; workers post through WorkerProgress 
+        handles (see worker()) into a shared-memory counter array. 
+        Usable as a context manager. 
+
+        --Parameters--
+        * index_maxes : List[int] // 
+            Each worker's (inclusive) final loop index. 
+        * prefix : str, optional // 
+            Gets printed on the same line just before the 
+            displayed progress,  
+                * by default ''. 
+        * interval : float, optional // 
+            Time (in s) between redraws,  
+                * by default 0.2. 
+        * stream : file-like, optional // 
+            Destination of the progress line,  
+                * by default None (i.e. sys.stdout). 
+        * enabled : bool, optional // 
+            Option to force output on or off,  
+                * by default None (i.e. only if stream is a TTY). 
+    """    
+
+    def __init__(
+        self, 
+        index_maxes:List[int], 
+        prefix:str='', 
+        interval:float=0.2, 
+        stream=None, 
+        enabled:bool=None, 
+    ):
+        self.totals = np.array(index_maxes, dtype=np.int64) + 1
+        self.prefix = prefix
+        self.interval = interval
+        self.stream = stream or sys.stdout
+        if enabled is None:
+            isatty = getattr(self.stream, 'isatty', None)
+            enabled = bool(isatty and isatty())
+        self.enabled = enabled
+        
+        from multiprocessing import shared_memory
+
+        n_workers = len(self.totals)
+        self.shm = shared_memory.SharedMemory(
+            create=True, size=8 * max(n_workers, 1)
+        )
+        self.counts = np.ndarray(
+            (n_workers,), dtype=np.int64, buffer=self.shm.buf
+        )
+        self.counts[:] = 0
+        shared_counters[self.shm.name] = self.counts
+        
+        self.init_time = time.perf_counter()
+        self.last_len = 0
+        self.stop_event = threading.Event()
+        self.thread = None
+
+    def worker(self, worker:int)->WorkerProgress:
+        """
+            Returns the progress handle of one worker. 
+
+            --Parameters--
+            * worker : int // 
+                Index of the worker (position in index_maxes). 
+
+            --Returns--
+            * handle : WorkerProgress // 
+                Picklable handle, to be passed to the worker. 
+        """    
+
+        return WorkerProgress(self.shm.name, worker)
+
+    def render(self):
+        """ 
+            Draws the combined progress, then each worker's percentage 
+            (or the slowest/fastest workers, if there are many). 
+        """
+
+        counts = np.minimum(self.counts, self.totals)
+        percents = 100 * counts // np.maximum(self.totals, 1)
+        percent_complete = 100 * counts.sum() // max(self.totals.sum(), 1)
+        elapsed = time.perf_counter() - self.init_time
+        
+        if len(percents) <= 8:
+            workers_str = ' '.join(f'{p:d}%' for p in percents)
+        else:
+            workers_str = f'slowest {percents.min()}%, ' \
+                + f'fastest {percents.max()}%'
+        line = (
+            self.prefix + f'progress: {percent_complete:d}% '
+            + f'[{workers_str}] ({seconds_to_timestring(elapsed)})'
+        )
+        padding = ' ' * max(self.last_len - len(line), 0)
+        self.stream.write('\r' + line + padding)
+        self.stream.flush()
+        self.last_len = len(line)
+
+    def _display_loop(self):
+        """ 
+            Body of the display thread. 
+        """
+
+        while not self.stop_event.wait(self.interval):
+            self.render()
+
+    def start(self):
+        """ 
+            Starts the display thread (if output is enabled). 
+        """
+
+        if self.enabled and self.thread is None:
+            self.thread = threading.Thread(
+                target=self._display_loop, daemon=True
+            )
+            self.thread.start()
+        
+        return self
+
+    def stop(self):
+        """ 
+            Stops the display thread, draws the final progress, and 
+            releases the shared counters. 
+        """
+
+        if self.thread is not None:
+            self.stop_event.set()
+            self.thread.join()
+            self.thread = None
+            self.render()
+            self.stream.write('\n')
+        
+        if self.shm is not None:
+            shared_counters.pop(self.shm.name, None)
+            del self.counts
+            self.shm.close()
+            self.shm.unlink()
+            self.shm = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+def hash_args(name:str, *args, **kwargs)->str:
+    """
+        Content hash of a function call, as used for the keys of 
+        disk_cache (and of common.run_sweep); arrays are hashed by 
+        dtype, shape and content (never by their repr, which numpy 
+        abbreviates), numpy scalars by value (so np.float64(0.1) 
+        and 0.1 agree), containers item by item, other values by 
+        repr. 
+
+        --Parameters--
+        * name : str // 
+            Name of the function (e.g. its qualified name). 
+        * *args, **kwargs // 
+            Arguments of the call. 
+
+        --Returns--
+        * key : str // 
+            Hex digest (32 characters). 
+    """    
+
+    hasher = hashlib.blake2b(name.encode(), digest_size=16)
+    _hash_value(hasher, args)
+    _hash_value(hasher, sorted(kwargs.items()))
+
+    return hasher.hexdigest()
+
+
+def _hash_value(hasher, value):
+    """ 
+        Feeds one argument into a hash object, for hash_args(). 
+    """
+
+    if isinstance(value, np.generic):
+        item = value.item()
+        if isinstance(item, np.generic): # e.g. np.longdouble
+            hasher.update(repr(value).encode())
+        else:
+            _hash_value(hasher, item)
+    elif isinstance(value, np.ndarray) and value.dtype != object:
+        hasher.update(f'{value.dtype.str}{value.shape}'.encode())
+        hasher.update(np.ascontiguousarray(value).view(np.uint8).data)
+    elif isinstance(value, np.ndarray):
+        hasher.update(f'object{value.shape}'.encode())
+        for item in value.flat:
+            _hash_value(hasher, item)
+    elif isinstance(value, (list, tuple)):
+        hasher.update(f'{type(value).__name__}{len(value)}'.encode())
+        for item in value:
+            _hash_value(hasher, item)
+    elif isinstance(value, dict):
+        hasher.update(f'dict{len(value)}'.encode())
+        for key in sorted(value, key=repr):
+            _hash_value(hasher, key)
+            _hash_value(hasher, value[key])
+    else:
+        hasher.update(repr(value).encode())
+
+
+def _evict(cache_dir:str, max_bytes:int):
+    """ 
+        Deletes the least recently used cache files (by mtime, 
+        which is refreshed on every hit) until the directory 
+        holds at most max_bytes. 
+    """
+
+    entries = []
+    for entry in os.scandir(cache_dir):
+        if entry.is_file() and entry.name.endswith(('.npy', '.pkl')):
+            stat = entry.stat()
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+    
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        try:
+            os.remove(path)
+        except OSError: # e.g. still memory-mapped on Windows
+            continue
+        total -= size
+
+
+def disk_cache(cache_dir:str='.cache', max_bytes:int=2**30):
+    """
+        Decorator which caches the results of an expensive function 
+        on disk, keyed by the function's qualified name and a content 
+        hash of its arguments (including numpy arrays); array results 
+        are stored as .npy files and returned (on hits and misses 
+        alike) as copy-on-write memory maps, i.e. writable arrays 
+        whose changes are never written back to the cache; other 
+        results are pickled. Least recently used files 
+        are evicted beyond max_bytes. Hit/miss counts can be printed 
+        with print_cache_stats() (or by housekeeping_final). 
+
+        --Parameters--
+        * cache_dir : str, optional // 
+            Directory of cached results (created if needed),  
+                * by default '.cache'. 
+        * max_bytes : int, optional // 
+            Size budget of cache_dir,  
+                * by default 2**30 (i.e. 1 GiB). 
+
+        --Returns--
+        * decorator : callable // 
+            Wraps a function, e.g. "@disk_cache('.cache')". 
+    """    
+
+    def decorator(func):
+        name = f'{func.__module__}.{func.__qualname__}'
+        stats = cache_stats.setdefault(name, {'hits': 0, 'misses': 0})
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            path = os.path.join(cache_dir, hash_args(name, *args, **kwargs))
+            
+            for ext in ('.npy', '.pkl'):
+                if os.path.exists(path + ext):
+                    stats['hits'] += 1
+                    os.utime(path + ext) # marks as recently used
+                    if ext == '.npy':
+                        return np.load(path + ext, mmap_mode='c')
+                    with open(path + ext, 'rb') as file:
+                        return pickle.load(file)
+
+            stats['misses'] += 1
+            result = func(*args, **kwargs)
+            os.makedirs(cache_dir, exist_ok=True)
+            if isinstance(result, np.ndarray) and result.dtype != object:
+                ext = '.npy'
+                tmp_path = path + '.tmp.npy'
+                np.save(tmp_path, result)
+            else:
+                ext = '.pkl'
+                tmp_path = path + '.tmp'
+                with open(tmp_path, 'wb') as file:
+                    pickle.dump(result, file)
+            os.replace(tmp_path, path + ext)
+            if ext == '.npy': # same kind of array as on later hits
+                result = np.load(path + ext, mmap_mode='c')
+            _evict(cache_dir, max_bytes)
+            
+            return result
+
+        return wrapper
+    
+    return decorator
+
+
+def print_cache_stats(prefix:str=''):
+    """
+        Prints the hit/miss counts of every function decorated 
+        with disk_cache which has been called. 
+
+        --Parameters--
+        * prefix: str, optional //
+            Gets printed at the start of each line,
+                * by default ''.
+    """    
+
+    if not emit('cache', stats=cache_stats):
+        return
+
+    for name, stats in cache_stats.items():
+        calls = stats['hits'] + stats['misses']
+        if calls:
+            print(
+                prefix + f'cache: {name} -- {stats["hits"]} hits, '
+                + f'{stats["misses"]} misses '
+                + f'({100 * stats["hits"] // calls}% hit rate)'
+            )
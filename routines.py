@@ -0,0 +1,446 @@
+import numpy as np
+import config
+import inspect
+import os
+from typing import Callable
+
+
+if True:
+    # np.fft accepts out= from numpy 2.0 onwards:
+    fft_has_out = 'out' in inspect.signature(np.fft.fft).parameters
+
+
+def _fft(arr:np.ndarray, out:np.ndarray):
+    """
+        Forward FFT of arr, written into out.
+    """
+
+    if fft_has_out:
+        np.fft.fft(arr, out=out)
+    else:
+        out[...] = np.fft.fft(arr)
+
+
+def _ifft(arr:np.ndarray, out:np.ndarray):
+    """
+        Inverse FFT of arr, written into out.
+    """
+
+    if fft_has_out:
+        np.fft.ifft(arr, out=out)
+    else:
+        out[...] = np.fft.ifft(arr)
+
+
+class EulerStepper:
+    """
+        Explicit (forward) Euler integrator for dy/dt = rhs(t, y),
+        stepping a whole state array in place.
+
+        --Parameters--
+        * rhs : Callable //
+            Right-hand side, called as rhs(t, y, out); it must write
+            dy/dt into out (rather than returning a new array),
+            so that no arrays are allocated per step.
+        * state : np.ndarray //
+            Initial state; it is copied once, and the copy
+            (self.state) is then updated in place.
+    """
+
+    def __init__(self, rhs:Callable, state:np.ndarray):
+        self.rhs = rhs
+        self.state = np.array(state)
+        self.k = np.empty_like(self.state)
+
+    def step(self, t:float, dt:float)->np.ndarray:
+        """
+            Advances the state from t to t + dt (in place).
+
+            --Parameters--
+            * t : float //
+                Current time.
+            * dt : float //
+                Time increment.
+
+            --Returns--
+            * state : np.ndarray //
+                The updated state (self.state).
+        """
+
+        self.rhs(t, self.state, self.k)
+        self.k *= dt
+        self.state += self.k
+
+        return self.state
+
+
+class RK4Stepper:
+    """
+        Classical fourth-order Runge-Kutta integrator for
+        dy/dt = rhs(t, y), stepping a whole state array in place;
+        all work buffers are allocated once, on construction.
+
+        --Parameters--
+        * rhs : Callable //
+            Right-hand side, called as rhs(t, y, out); it must write
+            dy/dt into out (rather than returning a new array).
+        * state : np.ndarray //
+            Initial state; it is copied once, and the copy
+            (self.state) is then updated in place.
+    """
+
+    def __init__(self, rhs:Callable, state:np.ndarray):
+        self.rhs = rhs
+        self.state = np.array(state)
+        self.k1, self.k2, self.k3, self.k4, self.tmp = (
+            np.empty_like(self.state) for _ in range(5)
+        )
+
+    def step(self, t:float, dt:float)->np.ndarray:
+        """
+            Advances the state from t to t + dt (in place).
+
+            --Parameters--
+            * t : float //
+                Current time.
+            * dt : float //
+                Time increment.
+
+            --Returns--
+            * state : np.ndarray //
+                The updated state (self.state).
+        """
+
+        y, k1, k2, k3, k4, tmp = (
+            self.state, self.k1, self.k2, self.k3, self.k4, self.tmp
+        )
+
+        self.rhs(t, y, k1)
+        np.multiply(k1, dt/2, out=tmp)
+        tmp += y
+        self.rhs(t + dt/2, tmp, k2)
+        np.multiply(k2, dt/2, out=tmp)
+        tmp += y
+        self.rhs(t + dt/2, tmp, k3)
+        np.multiply(k3, dt, out=tmp)
+        tmp += y
+        self.rhs(t + dt, tmp, k4)
+
+        # y += dt/6 * (k1 + 2*k2 + 2*k3 + k4):
+        k2 += k3
+        k2 *= 2
+        k1 += k4
+        k1 += k2
+        k1 *= dt/6
+        y += k1
+
+        return y
+
+
+class SplitStepSchrodinger:
+    """
+        Split-step Fourier (Strang splitting) integrator for the
+        1D Schrodinger equation,
+            i hbar dpsi/dt = -hbar^2/(2 mass) d^2psi/dx^2 + V psi,
+        with periodic boundaries; the phase factors are cached
+        for the most recent dt, and psi is stepped in place.
+
+        --Parameters--
+        * psi : np.ndarray //
+            Initial wavefunction on the grid points; it is copied
+            once (as complex128) into self.state.
+        * potential : np.ndarray //
+            Potential V on the grid points.
+        * grid : config.Grid, optional //
+            Spatial grid (supplies the FFT wavenumbers),
+                * by default None (i.e. config.x_grid()).
+        * mass : float, optional //
+            Particle mass,
+                * by default 1.
+        * hbar : float, optional //
+            Reduced Planck constant,
+                * by default None (i.e. config.hbar).
+    """
+
+    def __init__(
+        self,
+        psi:np.ndarray,
+        potential:np.ndarray,
+        grid:config.Grid=None,
+        mass:float=1,
+        hbar:float=None,
+    ):
+        self.grid = grid or config.x_grid()
+        self.state = np.array(psi, dtype=np.complex128)
+        self.potential = np.asarray(potential, dtype=np.float64)
+        self.mass = mass
+        self.hbar = config.hbar if hbar is None else hbar
+        self.psi_k = np.empty_like(self.state)
+        self.potential_phase = np.empty_like(self.state)
+        self.kinetic_phase = np.empty_like(self.state)
+        self.dt = None
+
+    def _set_dt(self, dt:float):
+        """
+            Recomputes the (half-step potential and full-step
+            kinetic) phase factors for a new time increment.
+        """
+
+        k = self.grid.wavenumbers
+        np.exp(
+            -0.5j * dt / self.hbar * self.potential,
+            out=self.potential_phase
+        )
+        np.exp(
+            -0.5j * self.hbar * dt / self.mass * k**2,
+            out=self.kinetic_phase
+        )
+        self.dt = dt
+
+    def step(self, t:float, dt:float)->np.ndarray:
+        """
+            Advances the wavefunction from t to t + dt (in place).
+
+            --Parameters--
+            * t : float //
+                Current time (unused; the potential is static).
+            * dt : float //
+                Time increment.
+
+            --Returns--
+            * state : np.ndarray //
+                The updated wavefunction (self.state).
+        """
+
+        if dt != self.dt:
+            self._set_dt(dt)
+
+        psi, psi_k = self.state, self.psi_k
+        psi *= self.potential_phase
+        _fft(psi, out=psi_k)
+        psi_k *= self.kinetic_phase
+        _ifft(psi_k, out=psi)
+        psi *= self.potential_phase
+
+        return psi
+
+
+def evolve(
+    stepper,
+    t_arr:np.ndarray=None,
+    observe:Callable=None,
+)->np.ndarray:
+    """
+        Steps an integrator (EulerStepper, RK4Stepper or
+        SplitStepSchrodinger) through a sequence of times.
+
+        --Parameters--
+        * stepper //
+            Integrator whose state is at time t_arr[0].
+        * t_arr : np.ndarray, optional //
+            Times at which the state is wanted,
+                * by default None (i.e. config.t_arr).
+        * observe : Callable, optional //
+            Called as observe(index, t, state) at each time
+            (including t_arr[0]); state is the live array, and
+            must be copied if it is to be kept,
+                * by default None.
+
+        --Returns--
+        * state : np.ndarray //
+            The state at time t_arr[-1].
+    """
+
+    if t_arr is None:
+        t_arr = config.t_arr
+
+    if observe:
+        observe(0, t_arr[0], stepper.state)
+    for i in range(1, len(t_arr)):
+        stepper.step(t_arr[i-1], t_arr[i] - t_arr[i-1])
+        if observe:
+            observe(i, t_arr[i], stepper.state)
+
+    return stepper.state
+
+
+class TrajectoryStore:
+    """
+        Disk-backed (t, x) trajectory, preallocated as a .npy file
+        of shape (len(t_arr), len(x_arr)) and written through
+        np.memmap, so memory use does not grow with the run length;
+        solver state is checkpointed alongside it every
+        checkpoint_every slices, and an existing store is resumed
+        from its last checkpointed slice.
+
+        --Parameters--
+        * path : str //
+            Path of the .npy file; the checkpoint is written next to
+            it, as <path without .npy>.checkpoint.npz.
+        * t_arr : np.ndarray, optional //
+            Times of the slices (axis 0),
+                * by default None (i.e. config.t_arr).
+        * x_arr : np.ndarray, optional //
+            Grid points of each slice (axis 1),
+                * by default None (i.e. config.x_arr).
+        * dtype : np.dtype, optional //
+            Data type of the stored slices,
+                * by default np.complex128.
+        * checkpoint_every : int, optional //
+            Number of slices between checkpoints,
+                * by default 100.
+    """
+
+    def __init__(
+        self,
+        path:str,
+        t_arr:np.ndarray=None,
+        x_arr:np.ndarray=None,
+        dtype:np.dtype=np.complex128,
+        checkpoint_every:int=100,
+    ):
+        self.path = path
+        self.checkpoint_path = checkpoint_path(path)
+        self.t_arr = config.t_arr if t_arr is None else np.asarray(t_arr)
+        self.x_arr = config.x_arr if x_arr is None else np.asarray(x_arr)
+        self.checkpoint_every = checkpoint_every
+        shape = (len(self.t_arr), len(self.x_arr))
+
+        self.n_done = 0
+        self.resume_state = None
+        if os.path.exists(path) and os.path.exists(self.checkpoint_path):
+            with np.load(self.checkpoint_path) as checkpoint:
+                saved = {key: checkpoint[key] for key in checkpoint.files}
+            if (
+                tuple(saved.pop('shape')) == shape
+                and np.array_equal(saved.pop('t_arr'), self.t_arr)
+            ):
+                self.n_done = int(saved.pop('n_done'))
+                saved.pop('x_arr')
+                self.resume_state = saved
+
+        if self.n_done:
+            self.data = np.lib.format.open_memmap(path, mode='r+')
+        else:
+            self.data = np.lib.format.open_memmap(
+                path, mode='w+', dtype=dtype, shape=shape
+            )
+
+    def append(self, slice_arr:np.ndarray, **state):
+        """
+            Writes the next time slice, checkpointing every
+            checkpoint_every slices (and after the final slice).
+
+            --Parameters--
+            * slice_arr : np.ndarray //
+                Values on x_arr at time t_arr[n_done].
+            * **state //
+                Solver state arrays to be saved at checkpoints
+                (returned as resume_state on resuming),
+                e.g. state=stepper.state.
+        """
+
+        self.data[self.n_done] = slice_arr
+        self.n_done += 1
+        if (
+            self.n_done % self.checkpoint_every == 0
+            or self.n_done == len(self.t_arr)
+        ):
+            self.checkpoint(**state)
+
+    def checkpoint(self, **state):
+        """
+            Flushes the written slices to disk, then (atomically)
+            records the number of complete slices and the solver
+            state.
+
+            --Parameters--
+            * **state //
+                Solver state arrays, as for append().
+        """
+
+        self.data.flush()
+        tmp_path = self.checkpoint_path + '.tmp.npz'
+        np.savez(
+            tmp_path,
+            n_done=self.n_done,
+            shape=self.data.shape,
+            t_arr=self.t_arr,
+            x_arr=self.x_arr,
+            **state
+        )
+        os.replace(tmp_path, self.checkpoint_path)
+
+    def close(self):
+        """
+            Flushes and releases the memory map.
+        """
+
+        self.data.flush()
+        del self.data
+
+
+def checkpoint_path(path:str)->str:
+    """
+        Path of the checkpoint file belonging to a trajectory file.
+    """
+
+    return os.path.splitext(path)[0] + '.checkpoint.npz'
+
+
+def evolve_to_store(stepper, store:TrajectoryStore)->np.ndarray:
+    """
+        Like evolve(), but appends the state at every time of
+        store.t_arr to a TrajectoryStore, and resumes from the
+        store's last checkpoint (if any); preempted runs can
+        therefore simply be restarted.
+
+        --Parameters--
+        * stepper //
+            Integrator whose state is at time store.t_arr[0]
+            (replaced by the checkpointed state when resuming).
+        * store : TrajectoryStore //
+            Destination of the trajectory.
+
+        --Returns--
+        * state : np.ndarray //
+            The state at time store.t_arr[-1].
+    """
+
+    t_arr = store.t_arr
+    if store.n_done:
+        stepper.state[...] = store.resume_state['state']
+    else:
+        store.append(stepper.state, state=stepper.state)
+
+    for i in range(store.n_done, len(t_arr)):
+        stepper.step(t_arr[i-1], t_arr[i] - t_arr[i-1])
+        store.append(stepper.state, state=stepper.state)
+
+    return stepper.state
+
+
+def load_trajectory(path:str)->tuple:
+    """
+        Opens a trajectory written by TrajectoryStore for reading;
+        slicing the returned data (e.g. data[::10, :]) gives
+        zero-copy windows, which can be passed to
+        common.build_plot directly.
+
+        --Parameters--
+        * path : str //
+            Path of the .npy file.
+
+        --Returns--
+        * t_arr, x_arr, data : Tuple[np.ndarray, np.ndarray, np.memmap] //
+            Times of the complete slices, grid points, and the
+            read-only memory map of the complete slices.
+    """
+
+    with np.load(checkpoint_path(path)) as checkpoint:
+        n_done = int(checkpoint['n_done'])
+        t_arr = checkpoint['t_arr'][:n_done]
+        x_arr = checkpoint['x_arr']
+    data = np.load(path, mmap_mode='r')[:n_done]
+
+    return t_arr, x_arr, data
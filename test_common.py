@@ -0,0 +1,343 @@
+# Behaviour checks for common's numerical routines; run with pytest,
+# or as a script.
+import os
+import tempfile
+import numpy as np
+import common
+
+
+def layouts(rng)->list:
+    """
+        Arrays of the memory layouts handled by the chunked
+        reductions: contiguous (C and F order), strided views,
+        transposed 3-D views, 0-d and single-row arrays.
+
+        --Returns--
+        * arrs : list //
+            Float arrays.
+    """
+
+    base = rng.standard_normal((12, 17))
+    cube = rng.standard_normal((4, 5, 6))
+
+    return [
+        base,
+        np.asfortranarray(base),
+        base[::2, 1::3],
+        base[:, ::-1],
+        cube.transpose(2, 0, 1),
+        cube[:, ::2, :],
+        np.array(3.5),
+        rng.standard_normal(50)[None, :],
+    ]
+
+
+def test_iter_chunks_cover_array():
+    rng = np.random.default_rng(1)
+    for arr in layouts(rng):
+        contiguous = arr.flags.c_contiguous or arr.flags.f_contiguous
+        order = 'K' if contiguous else 'C'
+        for chunk_size in (1, 3, 7, 64, 10**6):
+            chunks = list(common._iter_chunks(arr, chunk_size))
+            offsets = [offset for offset, _ in chunks]
+            sizes = [chunk.size for _, chunk in chunks]
+            assert offsets == list(np.cumsum([0] + sizes[:-1]))
+            assert max(sizes) <= max(chunk_size, 1)
+            np.testing.assert_array_equal(
+                np.concatenate([chunk.ravel(order=order) for _, chunk in chunks]),
+                arr.ravel(order=order),
+            )
+
+
+def test_iter_chunks_make_no_copies():
+    arr = np.arange(100.).reshape(10, 10)[:, ::2]
+    for _, chunk in common._iter_chunks(arr, 7):
+        assert np.shares_memory(chunk, arr)
+
+
+def test_reduce_arrays_matches_numpy():
+    rng = np.random.default_rng(2)
+    arrs = layouts(rng) + [
+        rng.standard_normal((6, 7)) + 1j * rng.standard_normal((6, 7)),
+    ]
+    flat = np.concatenate([np.ravel(arr) for arr in arrs])
+    vals = np.abs(flat) # complex arrays compare by magnitude
+    is_complex = np.concatenate([
+        np.full(np.size(arr), np.iscomplexobj(arr)) for arr in arrs
+    ])
+    vals = np.where(is_complex, vals, flat.real)
+    for chunk_size in (5, 2**16):
+        for workers in (1, 3):
+            out = common.reduce_arrays(
+                arrs, chunk_size=chunk_size, workers=workers
+            )
+            assert np.isclose(out.min, vals.min())
+            assert np.isclose(out.max, vals.max())
+            assert np.isclose(out.abs_max, np.abs(flat).max())
+            assert np.isclose(out.norm, np.linalg.norm(flat))
+
+
+def test_reduce_arrays_argmax_per_layout():
+    rng = np.random.default_rng(3)
+    for index, arr in enumerate(layouts(rng)):
+        positions = list(np.ndindex(arr.shape))
+        for position in positions[::max(len(positions) // 25, 1)]:
+            backup = arr[position]
+            arr[position] = 100. # arr is a view, so restored below
+            arrs = [np.zeros(3), arr, np.zeros((2, 2))]
+            for chunk_size in (1, 4, 2**16):
+                out = common.reduce_arrays(
+                    arrs, stats=('argmax',), chunk_size=chunk_size
+                )
+                assert out.argmax == (1, position), \
+                    (index, position, chunk_size)
+            arr[position] = backup
+
+
+def test_reduce_arrays_first_occurrence():
+    arrs = [np.zeros(4), np.array([1., 5., 5.]), np.array([5.])]
+    out = common.reduce_arrays(arrs, stats=('max', 'argmax'), chunk_size=1)
+    assert out.max == 5 and out.argmax == (1, (1,))
+
+
+def test_reduce_arrays_from_npy_path():
+    arr = np.random.default_rng(4).standard_normal((40, 30))
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, 'arr.npy')
+        np.save(path, np.asfortranarray(arr))
+        out = common.reduce_arrays([path], chunk_size=7)
+        position = np.unravel_index(np.argmax(arr), arr.shape)
+        assert out.argmax == (0, tuple(int(i) for i in position))
+        assert np.isclose(out.norm, np.linalg.norm(arr))
+        del out
+
+
+def test_reduce_arrays_rejects_bad_input():
+    for arrs, kwargs in [
+        ([np.zeros(3)], {'stats': ('median',)}), # unknown statistic
+        ([np.zeros(0)], {}), # no elements
+    ]:
+        try:
+            common.reduce_arrays(arrs, **kwargs)
+        except ValueError:
+            continue
+        raise AssertionError(f'no ValueError for {arrs}, {kwargs}')
+
+
+def test_abs_max_integers_and_inputs():
+    assert common.abs_max([np.array([-128, 5], dtype=np.int8)]) == 128
+    assert common.abs_max([np.array([3, 250], dtype=np.uint8)]) == 250
+    assert np.isclose(common.abs_max([np.array([3 + 4j, -1])]), 5)
+    rng = np.random.default_rng(5)
+    arrs = layouts(rng)
+    expected = max(np.abs(arr).max() for arr in arrs)
+    assert common.abs_max(arrs, chunk_size=3) == expected
+    assert common.abs_max(iter(arrs), chunk_size=3, workers=2) == expected
+
+
+def test_running_stats_match_batch():
+    rng = np.random.default_rng(6)
+    for dtype in (np.float64, np.complex128):
+        data = rng.standard_normal((300, 4, 5)) + 3
+        if dtype == np.complex128:
+            data = data + 1j * rng.standard_normal((300, 4, 5))
+        vals = np.abs(data) if dtype == np.complex128 else data
+        stats = common.RunningStats((4, 5), dtype, bins=8, hist_range=(0, 6))
+        for arr in data:
+            stats.update(arr)
+        assert stats.count == len(data)
+        np.testing.assert_allclose(stats.mean, data.mean(axis=0))
+        np.testing.assert_allclose(stats.var(), data.var(axis=0))
+        np.testing.assert_allclose(stats.var(ddof=1), data.var(axis=0, ddof=1))
+        np.testing.assert_allclose(stats.std(), data.std(axis=0))
+        np.testing.assert_array_equal(stats.min, vals.min(axis=0))
+        np.testing.assert_array_equal(stats.max, vals.max(axis=0))
+        np.testing.assert_array_equal(stats.abs_max, np.abs(data).max(axis=0))
+        hist, _ = np.histogram(np.clip(vals, 0, np.nextafter(6, 0)), 8, (0, 6))
+        np.testing.assert_array_equal(stats.hist, hist)
+
+
+def test_running_stats_merge():
+    rng = np.random.default_rng(7)
+    for dtype in (np.float64, np.complex128):
+        data = rng.standard_normal((200, 6)) * 5 + 100 # large mean
+        if dtype == np.complex128:
+            data = data - 1j * rng.standard_normal((200, 6))
+        def accumulate(part):
+            stats = common.RunningStats(6, dtype, bins=5, hist_range=(80, 120))
+            for arr in part:
+                stats.update(arr)
+            return stats
+        whole = accumulate(data)
+        # uneven parts, including an empty one, merged in turn:
+        bounds = [0, 1, 1, 70, 199, 200]
+        parts = [accumulate(data[a:b]) for a, b in zip(bounds[:-1], bounds[1:])]
+        merged = parts[0]
+        for part in parts[1:]:
+            merged.merge(part)
+        assert merged.count == whole.count
+        np.testing.assert_allclose(merged.mean, data.mean(axis=0))
+        np.testing.assert_allclose(merged.var(), data.var(axis=0))
+        np.testing.assert_allclose(merged.var(ddof=1), whole.var(ddof=1))
+        for name in ('min', 'max', 'abs_max', 'hist'):
+            np.testing.assert_array_equal(
+                getattr(merged, name), getattr(whole, name)
+            )
+        # merging into an empty accumulator copies the other:
+        empty = common.RunningStats(6, dtype, bins=5, hist_range=(80, 120))
+        np.testing.assert_allclose(empty.merge(whole).var(), whole.var())
+
+
+def test_running_stats_pickle_and_validation():
+    import pickle
+
+    stats = common.RunningStats(3, stats=('mean', 'var'))
+    stats.update(np.array([1., 2., 3.]))
+    copy = pickle.loads(pickle.dumps(stats))
+    copy.update(np.array([3., 2., 1.]))
+    np.testing.assert_allclose(copy.mean, [2., 2., 2.])
+    np.testing.assert_allclose(copy.var(), [1., 0., 1.])
+    assert stats.min is None and np.isnan(stats.var(ddof=1)).all()
+    for args, kwargs in [
+        ((3,), {'stats': ('median',)}),
+        ((3,), {'dtype': np.int64}),
+        ((3,), {'bins': 4}), # no hist_range
+    ]:
+        try:
+            common.RunningStats(*args, **kwargs)
+        except ValueError:
+            continue
+        raise AssertionError(f'no ValueError for {kwargs}')
+    try:
+        stats.merge(common.RunningStats(4, stats=('mean', 'var')))
+    except ValueError:
+        pass
+    else:
+        raise AssertionError('merged accumulators of different shapes')
+
+
+def lttb_reference(x_arr, y_arr, n_out)->np.ndarray:
+    """
+        Direct (unvectorized) largest-triangle-three-buckets,
+        following Steinarsson's description.
+
+        --Returns--
+        * indices : np.ndarray //
+            Indices of the selected points.
+    """
+
+    n = len(y_arr)
+    edges = [1 + i * (n - 2) // (n_out - 2) for i in range(n_out - 1)]
+    indices, a = [0], 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        if i + 1 < n_out - 2:
+            next_lo, next_hi = edges[i + 1], edges[i + 2]
+            x_mean = np.mean(x_arr[next_lo:next_hi])
+            y_mean = np.mean(y_arr[next_lo:next_hi])
+        else:
+            x_mean, y_mean = x_arr[-1], y_arr[-1]
+        best, best_area = lo, -1.
+        for j in range(lo, hi):
+            area = abs(
+                (x_arr[a] - x_mean) * (y_arr[j] - y_arr[a])
+                - (x_arr[a] - x_arr[j]) * (y_mean - y_arr[a])
+            )
+            if area > best_area:
+                best, best_area = j, area
+        indices.append(best)
+        a = best
+    indices.append(n - 1)
+
+    return np.array(indices)
+
+
+def test_decimate_minmax_keeps_envelope():
+    rng = np.random.default_rng(8)
+    for n, n_out in [(10**4, 200), (10**4 + 37, 51), (1001, 3)]:
+        x_arr = np.arange(n, dtype=float)
+        y_arr = np.cumsum(rng.standard_normal(n))
+        x_out, y_out = common.decimate_series(x_arr, y_arr, n_out)
+        assert len(x_out) <= n_out + 2
+        assert np.all(np.diff(x_out) > 0)
+        assert x_out[0] == x_arr[0] and x_out[-1] == x_arr[-1]
+        assert y_out.max() == y_arr.max() and y_out.min() == y_arr.min()
+        # every bucket's extrema survive:
+        bucket = -(-n // max((n_out - 2) // 2, 1))
+        for start in range(0, n, bucket):
+            kept = (x_out >= start) & (x_out < start + bucket)
+            assert y_out[kept].max() == y_arr[start:start + bucket].max()
+            assert y_out[kept].min() == y_arr[start:start + bucket].min()
+
+
+def test_decimate_lttb_matches_reference():
+    rng = np.random.default_rng(9)
+    for n, n_out in [(500, 40), (1003, 17), (100, 99)]:
+        x_arr = np.sort(rng.uniform(0, 10, n))
+        y_arr = np.sin(x_arr) + 0.1 * rng.standard_normal(n)
+        x_out, y_out = common.decimate_series(x_arr, y_arr, n_out, 'lttb')
+        indices = lttb_reference(x_arr, y_arr, n_out)
+        np.testing.assert_array_equal(x_out, x_arr[indices])
+        np.testing.assert_array_equal(y_out, y_arr[indices])
+
+
+def test_decimate_short_and_invalid():
+    x_arr, y_arr = np.arange(5.), np.arange(5.)
+    x_out, y_out = common.decimate_series(x_arr, y_arr, 10)
+    assert x_out is x_arr and y_out is y_arr
+    try:
+        common.decimate_series(np.arange(50.), np.arange(50.), 10, 'mean')
+    except ValueError:
+        pass
+    else:
+        raise AssertionError('no ValueError for an unknown method')
+
+
+def test_headless_live_plot_keeps_to_its_figure():
+    from matplotlib.image import imread
+
+    x_arr = np.linspace(0, 1, 50)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, 'plot.png')
+        def saved_plot()->np.ndarray:
+            common.build_plot(
+                'plot', [x_arr], [x_arr**2], headless=True, save_path=path
+            )
+            return imread(path)
+        before = saved_plot()
+        live = common.LivePlot(
+            'live', [x_arr], [np.sin(9 * x_arr)], 
+            headless=True, plot_colors=['r']
+        )
+        live.update([np.cos(9 * x_arr)], force=True)
+        np.testing.assert_array_equal(saved_plot(), before)
+        assert len(live.ax.lines) == 1 # not cleared by build_plot
+        live.finish()
+        np.testing.assert_array_equal(saved_plot(), before)
+
+
+def test_export_plots_writes_files():
+    x_arr = np.linspace(0, 1, 20)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for workers in (1, 2):
+            specs = [
+                dict(
+                    fig_label=f'fig_{i}', x_arrs=[x_arr], y_arrs=[x_arr**i], 
+                    save_path=os.path.join(tmp_dir, f'{workers}_{i}.png'), 
+                    headless=i % 2 == 0, # overridden either way
+                )
+                for i in range(3)
+            ]
+            done = sorted(common.export_plots(specs, workers=workers))
+            assert done == [
+                (i, spec['save_path']) for i, spec in enumerate(specs)
+            ]
+            for spec in specs:
+                assert os.path.getsize(spec['save_path']) > 0
+
+
+if __name__ == '__main__':
+    for name, test in list(globals().items()):
+        if name.startswith('test_'):
+            test()
+            print(f'{name}: ok')
@@ -0,0 +1,53 @@
+# Behaviour checks for config's grids; run with pytest, or as a script.
+import numpy as np
+import config
+
+
+def test_grid_points():
+    for start, stop, step, n in [(0, 1, 0.1, 11), (-5, 5, 0.05, 201)]:
+        grid = config.Grid(start, stop, step)
+        assert grid.n == len(grid.arr) == n # stop included
+        assert grid.arr[0] == start and np.isclose(grid.arr[-1], stop)
+        np.testing.assert_allclose(np.diff(grid.arr), step)
+
+
+def test_grid_weights_and_wavenumbers():
+    grid = config.Grid(-2, 3, 0.25)
+    # the trapezoid rule is exact for linear integrands:
+    assert np.isclose(np.sum((2 * grid.arr + 1) * grid.weights), 10)
+    assert np.isclose(grid.weights.sum(), grid.arr[-1] - grid.arr[0])
+    np.testing.assert_array_equal(
+        grid.wavenumbers, 2 * np.pi * np.fft.fftfreq(grid.n, d=grid.step)
+    )
+
+
+def test_grid_arrays_are_shared_and_read_only():
+    grid = config.grid(0, 2, 0.5)
+    assert config.grid(0, 2, 0.5) is grid
+    assert grid.arr is grid.arr
+    other = config.grid(0, 1, 0.25)
+    x_mesh, y_mesh = grid.mesh(other)
+    assert grid.mesh(other)[0] is x_mesh
+    assert x_mesh.shape == y_mesh.shape == (grid.n, other.n)
+    expected = np.meshgrid(grid.arr, other.arr, indexing='ij')
+    np.testing.assert_array_equal(x_mesh, expected[0])
+    np.testing.assert_array_equal(y_mesh, expected[1])
+    for arr in (grid.arr, grid.weights, grid.wavenumbers, x_mesh, y_mesh):
+        assert not arr.flags.writeable
+        try:
+            arr[0] = 1
+        except ValueError:
+            continue
+        raise AssertionError('wrote to a shared grid array')
+
+
+def test_x_and_t_grids_follow_config():
+    assert config.x_grid() is config.grid(0, config.x_max, config.dx)
+    assert config.t_grid() is config.grid(0, config.t_max, config.dt)
+
+
+if __name__ == '__main__':
+    for name, test in list(globals().items()):
+        if name.startswith('test_'):
+            test()
+            print(f'{name}: ok')
@@ -0,0 +1,121 @@
+# Behaviour checks for logistics; run with pytest, or as a script.
+import contextlib
+import io
+import numpy as np
+import logistics
+
+
+def sample_times()->np.ndarray:
+    """
+        Times (in s) covering every branch of the formatters:
+        sub-second, minutes, hours, 100+ hours, negative values,
+        and values at (or a rounding error away from) boundaries.
+
+        --Returns--
+        * ts : np.ndarray //
+            About 5500 times.
+    """
+
+    rng = np.random.default_rng(0)
+    edges = [
+        0, 0.005, 0.01, 0.29, 0.57, 1.15, 59.99, 59.999, 60,
+        3599.99, 3599.999, 3600, 3600.01, 86399.99,
+        359999.99, 360000, 3600 * 1234.5,
+        -0.005, -0.01, -1, -59.99, -3600, -360000.5,
+    ]
+
+    return np.concatenate([
+        edges,
+        rng.uniform(0, 60, 1000),
+        rng.uniform(0, 3600, 1000),
+        rng.uniform(0, 360000, 1000),
+        10**rng.uniform(-3, 7, 2000),
+        -10**rng.uniform(-3, 7, 500),
+    ])
+
+
+def test_timestrings_match_scalar():
+    ts = sample_times()
+    for full_str in (False, True):
+        expected = [
+            logistics.seconds_to_timestring(t, full_str=full_str) for t in ts
+        ]
+        out = logistics.seconds_to_timestrings(ts, full_str=full_str)
+        mismatches = [
+            (t, got, want) for t, got, want in zip(ts, out, expected)
+            if got != want
+        ]
+        assert not mismatches, mismatches[:5]
+
+
+def test_timestrings_keep_shape():
+    ts = sample_times()[:24].reshape(2, 3, 4)
+    out = logistics.seconds_to_timestrings(ts)
+    assert out.shape == ts.shape
+    assert out[1, 2, 3] == logistics.seconds_to_timestring(ts[1, 2, 3])
+
+
+def test_timestring_forms():
+    assert logistics.seconds_to_timestring(61.5) == '01:01.50'
+    assert logistics.seconds_to_timestring(61.5, full_str=True) == '00:01:01.50'
+    assert logistics.seconds_to_timestring(3600) == '01:00:00.00'
+    assert logistics.seconds_to_timestring(360000) == '100:00:00.00'
+    assert list(logistics.seconds_to_timestrings([61.5, 360000])) \
+        == ['01:01.50', '100:00:00.00']
+
+
+def test_timed_main_survives_housekeeping():
+    # the layout of template.py, with main() timed as a whole:
+    @logistics.timed_section('main')
+    def main():
+        logistics.housekeeping_initial(print_version=[False, False])
+        with logistics.timed_section('solve'):
+            pass
+        logistics.housekeeping_final(print_sections=True)
+
+    for _ in range(2):
+        main()
+        with logistics.timed_section('after'):
+            pass
+        root = logistics.section_root.to_dict()
+        names = [node['name'] for node in root['children']]
+        assert names == ['main', 'after'], names
+        main_node = root['children'][0]
+        assert main_node['count'] == 1
+        assert [node['name'] for node in main_node['children']] == ['solve']
+    assert len(logistics.section_state.stack) == 1 # only the root open
+
+
+def test_section_report_shows_open_sections():
+    logistics.reset_sections()
+    out = io.StringIO()
+    with logistics.timed_section('outer'):
+        with logistics.timed_section('inner'):
+            pass
+        with contextlib.redirect_stdout(out):
+            logistics.print_section_report()
+    lines = out.getvalue().splitlines()
+    assert 'outer (open)' in lines[1] and 'inner' in lines[2]
+
+
+def test_hash_args_by_content():
+    key = logistics.hash_args
+    big = np.arange(2000.)
+    changed = big.copy()
+    changed[1000] = -1 # hidden in the abbreviated repr
+    assert key('f', big) != key('f', changed)
+    assert key('f', big) == key('f', big.copy())
+    assert key('f', big) != key('f', big.astype(np.float32))
+    assert key('f', big) != key('f', big.reshape(40, 50))
+    # numpy scalars hash as the equal python values:
+    assert key('f', np.float64(0.1), n=np.int64(3)) == key('f', 0.1, n=3)
+    assert key('f', dx=np.linspace(0, 1, 11)[1]) == key('f', dx=0.1)
+    assert key('f', x=1, y=2) == key('f', y=2, x=1)
+    assert key('f', 1) != key('g', 1) and key('f', 1) != key('f', x=1)
+
+
+if __name__ == '__main__':
+    for name, test in list(globals().items()):
+        if name.startswith('test_'):
+            test()
+            print(f'{name}: ok')
@@ -0,0 +1,136 @@
+# Behaviour checks for the time steppers in routines; run with
+# pytest, or as a script.
+import os
+import tempfile
+import numpy as np
+import config
+import routines
+
+
+def decay(t, y, out):
+    np.negative(y, out=out)
+
+
+def decay_error(stepper_class, n_steps:int)->float:
+    """
+        Error at t = 1 in integrating dy/dt = -y from y(0) = 1.
+
+        --Parameters--
+        * stepper_class : type //
+            EulerStepper or RK4Stepper.
+        * n_steps : int //
+            Number of (equal) steps.
+
+        --Returns--
+        * error : float //
+            |y(1) - exp(-1)|.
+    """
+
+    stepper = stepper_class(decay, np.ones(1))
+    routines.evolve(stepper, np.linspace(0, 1, n_steps + 1))
+
+    return abs(stepper.state[0] - np.exp(-1))
+
+
+def test_stepper_convergence_orders():
+    for stepper_class, order in [
+        (routines.EulerStepper, 1),
+        (routines.RK4Stepper, 4),
+    ]:
+        errors = [decay_error(stepper_class, n) for n in (20, 40, 80)]
+        ratios = np.array(errors[:-1]) / np.array(errors[1:])
+        # halving dt divides the error by about 2**order:
+        assert np.allclose(np.log2(ratios), order, atol=0.1), \
+            (stepper_class.__name__, ratios)
+
+
+def test_steppers_work_in_place():
+    for stepper_class in (routines.EulerStepper, routines.RK4Stepper):
+        stepper = stepper_class(decay, np.ones(3))
+        state = stepper.state
+        assert stepper.step(0, 0.1) is state
+        assert np.all(state < 1)
+
+
+def test_split_step_plane_wave():
+    grid = config.grid(-5, 5, 0.05)
+    mass, hbar = 2., 1.
+    for m in (0, 3, -7):
+        k0 = grid.wavenumbers[m]
+        psi = np.exp(1j * k0 * grid.arr)
+        stepper = routines.SplitStepSchrodinger(
+            psi, np.zeros(grid.n), grid, mass=mass, hbar=hbar
+        )
+        t_arr = np.linspace(0, 3, 31)
+        routines.evolve(stepper, t_arr)
+        # V = 0: exact up to rounding, for any dt:
+        expected = psi * np.exp(-0.5j * hbar * k0**2 * t_arr[-1] / mass)
+        np.testing.assert_allclose(stepper.state, expected, atol=1e-10)
+
+
+def test_split_step_conserves_norm():
+    grid = config.grid(-10, 10, 0.1)
+    x = grid.arr
+    psi = np.exp(-(x - 2)**2 + 3j * x)
+    stepper = routines.SplitStepSchrodinger(psi, 0.5 * x**2, grid, hbar=1.)
+    norm = np.sum(np.abs(psi)**2)
+    for dt in (0.01, 0.02, 0.01):
+        for _ in range(50):
+            stepper.step(0, dt)
+        assert np.isclose(np.sum(np.abs(stepper.state)**2), norm, rtol=1e-12)
+
+
+def test_evolve_observes_every_time():
+    t_arr = np.linspace(0, 1, 11)
+    seen = []
+    def observe(i, t, state):
+        seen.append((i, t, state[0]))
+    stepper = routines.EulerStepper(decay, np.ones(1))
+    state = routines.evolve(stepper, t_arr, observe)
+    assert [i for i, _, _ in seen] == list(range(len(t_arr)))
+    assert [t for _, t, _ in seen] == list(t_arr)
+    assert seen[0][2] == 1 and seen[-1][2] == state[0] == 0.9**10
+
+
+def test_trajectory_store_resumes():
+    t_arr = np.linspace(0, 1, 26)
+    x_arr = np.arange(4.)
+    reference = routines.RK4Stepper(decay, x_arr + 1)
+    expected = [reference.state.copy()]
+    for i in range(1, len(t_arr)):
+        reference.step(t_arr[i-1], t_arr[i] - t_arr[i-1])
+        expected.append(reference.state.copy())
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, 'trajectory.npy')
+        # an interrupted run, stopped after 13 slices (checkpoint at 10):
+        store = routines.TrajectoryStore(
+            path, t_arr, x_arr, np.float64, checkpoint_every=5
+        )
+        stepper = routines.RK4Stepper(decay, x_arr + 1)
+        store.append(stepper.state, state=stepper.state)
+        for i in range(1, 13):
+            stepper.step(t_arr[i-1], t_arr[i] - t_arr[i-1])
+            store.append(stepper.state, state=stepper.state)
+        store.close()
+
+        store = routines.TrajectoryStore(
+            path, t_arr, x_arr, np.float64, checkpoint_every=5
+        )
+        assert store.n_done == 10
+        stepper = routines.RK4Stepper(decay, np.zeros(4))
+        routines.evolve_to_store(stepper, store)
+        store.close()
+
+        t_out, x_out, data = routines.load_trajectory(path)
+        np.testing.assert_array_equal(t_out, t_arr)
+        np.testing.assert_array_equal(x_out, x_arr)
+        np.testing.assert_allclose(data, expected, rtol=1e-14)
+        del data
+
+
+if __name__ == '__main__':
+    for name, test in list(globals().items()):
+        if name.startswith('test_'):
+            test()
+            print(f'{name}: ok')